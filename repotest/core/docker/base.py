@@ -1,15 +1,19 @@
 import concurrent.futures
 import logging
 import os
+import random
+import sys
+import time
 from abc import abstractmethod
 from functools import cached_property
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 import docker
-from docker.errors import APIError, NotFound
+from docker.errors import APIError, ImageNotFound, NotFound
 from git import GitCommandError
 # from repotest.utils.timeout import  timeout_decorator, TimeOutException
-from repotest.constants import (DEFAULT_CACHE_FOLDER,
+from repotest.constants import (DEFAULT_BUILD_TIMEOUT_INT,
+                                DEFAULT_CACHE_FOLDER,
                                 DEFAULT_COMMIT_TIMEOUT_INT,
                                 DEFAULT_CONTAINER_MEM_LIMIT,
                                 DEFAULT_EVAL_TIMEOUT_INT,
@@ -37,6 +41,20 @@ class AbstractDockerRepo(AbstractRepo):
     _TEST_EVAL_TIMEOUT = DEFAULT_EVAL_TIMEOUT_INT
     MEM_LIMIT = DEFAULT_CONTAINER_MEM_LIMIT
     _FALL_WITH_TIMEOUT_EXCEPTION = False
+    # Names of images known to exist, shared by all instances (see _image_exists)
+    _EXISTING_IMAGES = set()
+    # Names of Docker volumes known to exist (see create_volume)
+    _KNOWN_VOLUMES = set()
+    # Docker Desktop on macOS honours bind-mount consistency hints: the container is
+    # authoritative for the workdir, the host for the (read-mostly) dependency caches.
+    if sys.platform == "darwin":
+        _WORKDIR_MOUNT_MODE = "rw,delegated"
+        _CACHE_MOUNT_MODE = "rw,cached"
+    else:
+        _WORKDIR_MOUNT_MODE = "rw"
+        _CACHE_MOUNT_MODE = "rw"
+    # Upper bound (seconds) for the backoff between image commit retries
+    _COMMIT_RETRY_MAX_DELAY = 30
 
     def __init__(
         self,
@@ -75,6 +93,8 @@ class AbstractDockerRepo(AbstractRepo):
         self.image_name = image_name
         assert cache_mode in ("download", "shared", "local", "volume", "build")
         self.cache_mode = cache_mode
+        # Mounts built by _setup_container_volumes, keyed by (workdir, cache_mode, cache_folder)
+        self._volumes_cache = {}
         self.docker_client
 
     def change_mem_limit(self, mem_limit: str) -> None:
@@ -196,9 +216,17 @@ class AbstractDockerRepo(AbstractRepo):
         return
     
     def _image_exists(self, name: str) -> bool:
-        """Check if a Docker image exists."""
+        """
+        Check if a Docker image exists.
+
+        Positive answers are cached for the whole process (images do not vanish
+        mid-run); negative ones are not, as the image may be built later.
+        """
+        if name in self._EXISTING_IMAGES:
+            return True
         try:
             self.docker_client.images.get(name)
+            self._EXISTING_IMAGES.add(name)
             return True
         except ImageNotFound:
             return False
@@ -219,6 +247,7 @@ class AbstractDockerRepo(AbstractRepo):
 
             # Remove the image
             self.docker_client.images.remove(image.id, force=True)
+            self._EXISTING_IMAGES.discard(self.image_name)
             logger.debug(f"Image '{self.image_name}' deleted successfully.")
 
         except docker.errors.ImageNotFound:
@@ -238,12 +267,16 @@ class AbstractDockerRepo(AbstractRepo):
                 self.container.commit(self.default_image_name)
                 logger.info("Successfully committed container to image")
                 self.image_name = self.default_image_name
+                # Later was_build checks see the fresh image without asking the daemon
+                self._EXISTING_IMAGES.add(self.default_image_name)
                 return
             except APIError as e:
                 logger.warning(f"Failed to commit image (attempt {attempt + 1}): {e}")
                 if attempt == retries - 1:
                     raise
-                time.sleep(delay)
+                # Exponential backoff with jitter: a daemon that recovers quickly is
+                # retried sooner, and parallel runners do not retry in lockstep
+                time.sleep(min(self._COMMIT_RETRY_MAX_DELAY, delay * 2 ** attempt) + random.random())
     
     def stop_container(self, timeout=0):
         logger.debug("Stopping container")
@@ -259,11 +292,59 @@ class AbstractDockerRepo(AbstractRepo):
             logger.info("Container not found %s" % (self.container.name))
             logger.critical(e, exc_info=True)
 
+    def _container_volumes(self, workdir: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+        """
+        Mounts for a container of this repo (see _setup_container_volumes).
+
+        The repo itself is bound at ``workdir``; runners add their cache mounts on top.
+        """
+        volumes = {}
+        if workdir:
+            volumes[self.cache_folder] = {"bind": workdir, "mode": self._WORKDIR_MOUNT_MODE}
+        return volumes
+
+    @property
+    def _local_cache_dirs(self) -> Tuple[str, ...]:
+        """Host directories mounted as caches in the "local" cache mode."""
+        return ()
+
+    def _setup_container_volumes(self, workdir: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+        """
+        Mounts for a container of this repo, from ``_container_volumes``.
+
+        build_env and run_test ask for the same mounts, so they (and the named Docker
+        volumes) are built once per instance. The "local" cache directories are
+        recreated on every call, as ``git clean`` may have removed them since.
+        """
+        if self.cache_mode == "local":
+            for path in self._local_cache_dirs:
+                os.makedirs(path, exist_ok=True)
+        key = (workdir, self.cache_mode, self.cache_folder)
+        volumes = self._volumes_cache.get(key)
+        if volumes is None:
+            volumes = self._volumes_cache[key] = self._container_volumes(workdir)
+        return volumes
+
+    def _container_running(self) -> bool:
+        """Check that the container of this repo still exists and is running."""
+        container = getattr(self, "container", None)
+        if container is None:
+            return False
+        try:
+            container.reload()
+        except (NotFound, APIError):
+            return False
+        return container.status == "running"
+
     def _convert_std_from_bytes_to_str(self):
         for key in ["stdout", "stderr", "std"]:
             if hasattr(self, key):
-                if isinstance(getattr(self, key), bytes):
-                    s = self._bytes_to_string(getattr(self, key))
+                value = getattr(self, key)
+                if isinstance(value, bytearray):
+                    # Partial output of a timed-out exec_run
+                    value = bytes(value)
+                if isinstance(value, bytes):
+                    s = self._bytes_to_string(value)
                     setattr(self, key, s)
 
     @classmethod
@@ -280,6 +361,9 @@ class AbstractDockerRepo(AbstractRepo):
         """
         Execute a command inside a Docker container with a timeout.
         """
+        # Start from empty bytes, not whatever the previous call was decoded to:
+        # timeout handlers append b"Timeout exception" even if exec_run never returned
+        self.stdout = self.stderr = self.std = b""
 
         def _run_command():
             logger.debug(f"Executing command in Docker container: {command}")
@@ -288,9 +372,11 @@ class AbstractDockerRepo(AbstractRepo):
                 command, stream=True, tty=False, stdout=True, stderr=True, demux=True
             )
             self.return_code = 0
-            self.stdout = b""
-            self.stderr = b""
-            self.std = b""
+            # bytearrays grow in place (bytes += bytes copies everything read so far);
+            # they are visible as-is if the command times out mid-stream
+            self.stdout = bytearray()
+            self.stderr = bytearray()
+            self.std = bytearray()
 
             for stdout, stderr in self.last_stream:
                 if stdout:
@@ -302,6 +388,9 @@ class AbstractDockerRepo(AbstractRepo):
                     self.return_code = 1
                     self.stderr += stderr
                     self.std += stderr
+            self.stdout = bytes(self.stdout)
+            self.stderr = bytes(self.stderr)
+            self.std = bytes(self.std)
             return
 
         logger.info(f"timeout seconds={timeout}")
@@ -351,6 +440,10 @@ class AbstractDockerRepo(AbstractRepo):
     #     return
 
     def create_volume(self, volume_name):
+        # Cache volumes are shared by every repo in the process; once one is
+        # known to exist, later build_env/run_test calls skip the API round-trip
+        if volume_name in self._KNOWN_VOLUMES:
+            return
         try:
             volume = self.docker_client.volumes.get(volume_name)
             logger.debug(f"Volume '{volume_name}' exists.")
@@ -358,8 +451,10 @@ class AbstractDockerRepo(AbstractRepo):
             logger.info(f"Volume '{volume_name}' does not exist.")
             volume = self.docker_client.volumes.create(name=volume_name)
             logger.info(f"Volume created: {volume.name}")
+        self._KNOWN_VOLUMES.add(volume_name)
 
     def delete_volume(self, volume_name):
+        self._KNOWN_VOLUMES.discard(volume_name)
         try:
             volume = self.docker_client.volumes.get(volume_name)
             volume.remove()
@@ -457,6 +552,24 @@ class AbstractDockerRepo(AbstractRepo):
     def run_test(self, command):
         pass
 
+    def __call__(self, command_build: str, command_test: str, timeout_build: int = DEFAULT_BUILD_TIMEOUT_INT,
+                 timeout_test: int = DEFAULT_EVAL_TIMEOUT_INT, keep_alive: bool = False):
+        """
+        Build the environment if needed, then run the tests.
+
+        With ``keep_alive=True`` a freshly built container is left running and the
+        tests run in it, instead of stopping it and starting one from the committed image.
+        This needs a runner whose ``build_env`` takes ``stop_container`` and whose
+        ``run_test`` takes ``reuse_container``.
+        """
+        if keep_alive:
+            if not self.was_build:
+                self.build_env(command=command_build, timeout=timeout_build, stop_container=False)
+            return self.run_test(command=command_test, timeout=timeout_test, reuse_container=True)
+        if not self.was_build:
+            self.build_env(command=command_build, timeout=timeout_build)
+        return self.run_test(command=command_test, timeout=timeout_test)
+
     def __del__(self):
         """
         Cleanup the repository cache using an Alpine container.
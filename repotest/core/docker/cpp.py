@@ -1,130 +1,384 @@
+import io
 import json
 import logging
 import os
+import posixpath
+import re
 import time
+import xml.etree.ElementTree as ET
+import xml.sax
 from functools import cached_property
-from typing import Dict, Optional
-from docker.errors import APIError, ImageNotFound
+from typing import Dict, List, Optional, Tuple, Union
 from repotest.constants import DEFAULT_BUILD_TIMEOUT_INT, DEFAULT_CACHE_FOLDER, DEFAULT_EVAL_TIMEOUT_INT
 from repotest.core.docker.base import AbstractDockerRepo
+from repotest.core.docker.report_files import scan_report_files
 from repotest.core.exceptions import TimeOutException
 from repotest.core.docker.types import CacheMode
 
 logger = logging.getLogger("repotest")
 
+_REPORT_EXTS = frozenset(("json", "xml"))
+_JSON_EXTS = frozenset(("json",))
+_CTEST_XML_NAME = "Test.xml"
+_MAX_TEST_BINARIES = 10
+# Container paths: the repo (cache_folder) is mounted at /run_dir and built into build/
+_CONTAINER_WORKDIR = "/run_dir"
+_CONTAINER_BUILD_DIR = "/run_dir/build"
+_BINARY_EXIT_RE = re.compile(rb"^__REPOTEST_EXIT__:(.+):(\d+)\r?$", re.MULTILINE)
 
-def parse_cpp_test_report(report_path: str) -> Dict[str, object]:
-    if not os.path.exists(report_path):
-        return {}
-    
+
+def _scan_ctest_xml_files(testing_dir: str) -> List[str]:
+    """Return the ``<testing_dir>/<tag>/Test.xml`` files written by CTest."""
+    found = []
     try:
-        with open(report_path, "r") as f:
-            content = f.read()
-            
-            if content.strip().startswith("{") or content.strip().startswith("["):
-                return _parse_cpp_json(content)
-            
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(content)
-            
-            result = {
-                "tests": [],
-                "summary": {
-                    "total": 0,
-                    "passed": 0,
-                    "failed": 0,
-                    "skipped": 0,
-                    "errors": 0,
-                    "collected": 0
-                }
+        entries = os.scandir(testing_dir)
+    except (FileNotFoundError, NotADirectoryError):
+        return found
+    with entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            try:
+                with os.scandir(entry.path) as sub_entries:
+                    for sub_entry in sub_entries:
+                        if sub_entry.name == _CTEST_XML_NAME:
+                            found.append(sub_entry.path)
+            except OSError:
+                continue
+    return found
+
+
+def _dedupe_test_binaries(binaries: List[str], limit: int, host_dir: str) -> List[str]:
+    """
+    Keep one binary per basename, smallest first, and at most ``limit`` of them.
+
+    ``binaries`` are container paths below ``/run_dir``, which is mounted from ``host_dir``,
+    so the sizes are read on the host. Small binaries (plain gtest suites) usually finish
+    fastest; a binary that can't be stat'ed goes last.
+    """
+    def size(binary: str) -> float:
+        try:
+            return os.path.getsize(os.path.join(host_dir, posixpath.relpath(binary, _CONTAINER_WORKDIR)))
+        except OSError:
+            return float("inf")
+
+    seen = set()
+    unique = []
+    for binary in sorted(binaries, key=size):
+        base = posixpath.basename(binary)
+        if base in seen:
+            continue
+        seen.add(base)
+        unique.append(binary)
+        if len(unique) == limit:
+            break
+    return unique
+
+
+def _binary_test_name(binary: str) -> str:
+    """Name of a test binary: its path relative to the build dir, e.g. ``tests/foo_test``."""
+    return posixpath.relpath(binary, _CONTAINER_BUILD_DIR)
+
+
+def _binary_file_stem(name: str) -> str:
+    """File name stem for the log/json of a binary, unique for each test name."""
+    return name.replace("/", "__")
+
+
+def _batched_binaries_command(binaries: List[str]) -> str:
+    """
+    Build a shell script that runs all ``binaries`` in the background and waits for them.
+
+    Each binary runs once with ``--gtest_output``; only a binary that fails without
+    writing the gtest JSON (not a gtest binary) is run again without the flag. Output
+    goes to ``/run_dir/test-results/<stem>.log`` and the exit code is echoed as a
+    ``__REPOTEST_EXIT__:<name>:<code>`` line, see ``_BINARY_EXIT_RE``.
+    """
+    jobs = []
+    for binary in binaries:
+        name = _binary_test_name(binary)
+        stem = _binary_file_stem(name)
+        log = f"/run_dir/test-results/{stem}.log"
+        report = f"/run_dir/test-results/{stem}.json"
+        jobs.append(
+            f"( {binary} --gtest_output=json:{report} >{log} 2>&1; rc=$?;"
+            f" if [ $rc -ne 0 ] && [ ! -f {report} ]; then {binary} >>{log} 2>&1; rc=$?; fi;"
+            f" echo \"__REPOTEST_EXIT__:{name}:$rc\" ) &"
+        )
+    return "mkdir -p /run_dir/test-results && cd /run_dir/build && { " + " ".join(jobs) + " wait; }"
+
+
+def _binary_results(binaries: List[str], stdout: bytes, log_dir: str) -> Dict[str, object]:
+    """
+    Build a report from the exit markers a ``_batched_binaries_command`` run printed.
+
+    A binary without a marker was still running when the exec timed out and is
+    reported as failed.
+    """
+    exit_codes = {}
+    for match in _BINARY_EXIT_RE.finditer(stdout):
+        exit_codes[match.group(1).decode("utf-8", errors="ignore")] = int(match.group(2))
+
+    result = {
+        "tests": [],
+        "summary": {"total": 0, "passed": 0, "failed": 0, "skipped": 0, "errors": 0, "collected": 0}
+    }
+    for binary in binaries:
+        name = _binary_test_name(binary)
+        code = exit_codes.get(name)
+        result["summary"]["total"] += 1
+        if code == 0:
+            result["summary"]["passed"] += 1
+            result["tests"].append({
+                "name": name,
+                "classname": "binary_test",
+                "time": 0.0,
+                "status": "passed"
+            })
+            continue
+        result["summary"]["failed"] += 1
+        log_path = os.path.join(log_dir, f"{_binary_file_stem(name)}.log")
+        try:
+            with open(log_path, "rb") as f:
+                message = f.read(200).decode("utf-8", errors="ignore")
+        except OSError:
+            message = ""
+        if code is None:
+            message = "Timed out" + (f": {message}" if message else "")
+        result["tests"].append({
+            "name": name,
+            "classname": "binary_test",
+            "time": 0.0,
+            "status": "failed",
+            "message": message
+        })
+    result["summary"]["collected"] = result["summary"]["total"]
+    result["status"] = "passed" if result["summary"]["failed"] == 0 else "failed"
+    return result
+
+
+class _CTestHandler(xml.sax.ContentHandler):
+    """
+    Streaming handler for CTest ``<Site>`` reports.
+
+    Emits one test record per ``<Test>`` element below ``<Testing>`` as soon as the
+    element is closed, so no DOM is built for large dashboard files.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.result = {
+            "tests": [],
+            "summary": {"total": 0, "passed": 0, "failed": 0, "skipped": 0, "errors": 0, "collected": 0}
+        }
+        self._depth = 0
+        self._testing_depth = 0
+        self._test_depth = 0
+        self._field = None
+        self._fields = {}
+        self._status_attr = None
+        self._in_measurement = False
+        self._measurement_done = False
+        self._measurement = None
+
+    def startElement(self, name, attrs):
+        self._depth += 1
+        if self._in_measurement:
+            # Measurement text ends at its first child, as with Element.text
+            self._in_measurement = False
+            self._measurement_done = True
+        if name == "Testing":
+            if not self._testing_depth:
+                self._testing_depth = self._depth
+        elif not self._test_depth:
+            if name == "Test" and self._testing_depth:
+                self._test_depth = self._depth
+                self._fields = {}
+                self._status_attr = attrs.get("Status")
+                self._measurement = None
+                self._measurement_done = False
+        elif self._depth == self._test_depth + 1 and name in ("Name", "Path", "Status") and name not in self._fields:
+            self._field = name
+            self._fields[name] = []
+        elif name == "Measurement" and not self._measurement_done and self._measurement is None:
+            self._measurement = []
+            self._in_measurement = True
+
+    def characters(self, content):
+        if self._field is not None:
+            self._fields[self._field].append(content)
+        elif self._in_measurement:
+            self._measurement.append(content)
+
+    def endElement(self, name):
+        if self._field is not None and name == self._field:
+            self._field = None
+        elif name == "Measurement" and self._in_measurement:
+            self._in_measurement = False
+            self._measurement_done = True
+        elif self._depth == self._test_depth:
+            self._test_depth = 0
+            self._emit()
+        elif self._depth == self._testing_depth:
+            self._testing_depth = 0
+        self._depth -= 1
+
+    def _emit(self):
+        fields = self._fields
+        if "Name" not in fields:
+            return
+        if "Status" in fields:
+            test_status = "".join(fields["Status"])
+        else:
+            test_status = self._status_attr or "unknown"
+        summary = self.result["summary"]
+        summary["total"] += 1
+        test_info = {
+            "name": "".join(fields["Name"]),
+            "classname": "".join(fields["Path"]) if "Path" in fields else "",
+            "time": 0.0,
+            "status": "passed" if test_status == "passed" else "failed"
+        }
+        if test_status == "passed":
+            summary["passed"] += 1
+        else:
+            summary["failed"] += 1
+            if self._measurement is not None:
+                text = "".join(self._measurement)
+                test_info["message"] = text
+                test_info["details"] = text
+        self.result["tests"].append(test_info)
+
+
+def _parse_ctest_site(content: bytes) -> Dict[str, object]:
+    handler = _CTestHandler()
+    xml.sax.parseString(content, handler)
+    return handler.result
+
+
+def _xml_root_tag(content: bytes) -> str:
+    """Tag of the root element, read from its start tag without parsing the rest."""
+    _, root = next(ET.iterparse(io.BytesIO(content), events=("start",)))
+    return root.tag
+
+
+def _parse_junit_xml(root: ET.Element, detailed: bool) -> Dict[str, object]:
+    result = {
+        "tests": [],
+        "summary": {
+            "total": 0,
+            "passed": 0,
+            "failed": 0,
+            "skipped": 0,
+            "errors": 0,
+            "collected": 0
+        }
+    }
+    
+    testsuites = root.findall(".//testsuite")
+    if not testsuites and root.tag == "testsuite":
+        testsuites = [root]
+    
+    for testsuite in testsuites:
+        failures = int(testsuite.get("failures", 0))
+        errors = int(testsuite.get("errors", 0))
+        skipped = int(testsuite.get("skipped", 0))
+        result["summary"]["total"] += int(testsuite.get("tests", 0))
+        result["summary"]["failed"] += failures
+        result["summary"]["errors"] += errors
+        result["summary"]["skipped"] += skipped
+
+        if not detailed and failures + errors + skipped == 0:
+            # All passed: the suite attributes already carry the whole summary
+            continue
+        
+        for testcase in testsuite.findall("testcase"):
+            test_info = {
+                "name": testcase.get("name"),
+                "classname": testcase.get("classname"),
+                "time": float(testcase.get("time", 0)),
+                "status": "passed"
             }
             
-            if root.tag == "Site":
-                for testing in root.findall(".//Testing"):
-                    for test in testing.findall(".//Test"):
-                        status_elem = test.find("Status")
-                        name_elem = test.find("Name")
-                        path_elem = test.find("Path")
-                        
-                        if name_elem is not None:
-                            test_status = status_elem.text if status_elem is not None else "unknown"
-                            test_name = name_elem.text
-                            test_path = path_elem.text if path_elem is not None else ""
-                            
-                            result["summary"]["total"] += 1
-                            
-                            test_info = {
-                                "name": test_name,
-                                "classname": test_path,
-                                "time": 0.0,
-                                "status": "passed" if test_status == "passed" else "failed"
-                            }
-                            
-                            if test_status == "passed":
-                                result["summary"]["passed"] += 1
-                            else:
-                                result["summary"]["failed"] += 1
-                                measurement = test.find(".//Measurement")
-                                if measurement is not None:
-                                    test_info["message"] = measurement.text or ""
-                                    test_info["details"] = measurement.text or ""
-                            
-                            result["tests"].append(test_info)
-            else:
-                testsuites = root.findall(".//testsuite")
-                if not testsuites and root.tag == "testsuite":
-                    testsuites = [root]
-                
-                for testsuite in testsuites:
-                    result["summary"]["total"] += int(testsuite.get("tests", 0))
-                    result["summary"]["failed"] += int(testsuite.get("failures", 0))
-                    result["summary"]["errors"] += int(testsuite.get("errors", 0))
-                    result["summary"]["skipped"] += int(testsuite.get("skipped", 0))
-                    
-                    for testcase in testsuite.findall("testcase"):
-                        test_info = {
-                            "name": testcase.get("name"),
-                            "classname": testcase.get("classname"),
-                            "time": float(testcase.get("time", 0)),
-                            "status": "passed"
-                        }
-                        
-                        failure = testcase.find("failure")
-                        error = testcase.find("error")
-                        skipped = testcase.find("skipped")
-                        
-                        if failure is not None:
-                            test_info["status"] = "failed"
-                            test_info["message"] = failure.get("message", "")
-                            test_info["details"] = failure.text or ""
-                        elif error is not None:
-                            test_info["status"] = "error"
-                            test_info["message"] = error.get("message", "")
-                            test_info["details"] = error.text or ""
-                        elif skipped is not None:
-                            test_info["status"] = "skipped"
-                            test_info["message"] = skipped.get("message", "")
-                        
-                        result["tests"].append(test_info)
-                
-                result["summary"]["passed"] = (
-                    result["summary"]["total"] 
-                    - result["summary"]["failed"] 
-                    - result["summary"]["errors"] 
-                    - result["summary"]["skipped"]
-                )
-            
-            result["summary"]["collected"] = result["summary"]["total"]
-            result["status"] = "passed" if (result["summary"]["failed"] + result["summary"]["errors"]) == 0 and result["summary"]["total"] > 0 else "failed"
-            
-            return result
+            # Single pass over the children instead of three find() walks;
+            # the first element of each kind wins, as find() would return.
+            failure = error = skipped = None
+            for child in testcase:
+                tag = child.tag
+                if tag == "failure":
+                    if failure is None:
+                        failure = child
+                elif tag == "error":
+                    if error is None:
+                        error = child
+                elif tag == "skipped":
+                    if skipped is None:
+                        skipped = child
+
+            if failure is not None:
+                test_info["status"] = "failed"
+                test_info["message"] = failure.get("message", "")
+                test_info["details"] = failure.text or ""
+            elif error is not None:
+                test_info["status"] = "error"
+                test_info["message"] = error.get("message", "")
+                test_info["details"] = error.text or ""
+            elif skipped is not None:
+                test_info["status"] = "skipped"
+                test_info["message"] = skipped.get("message", "")
             
+            result["tests"].append(test_info)
+    
+    result["summary"]["passed"] = (
+        result["summary"]["total"] 
+        - result["summary"]["failed"] 
+        - result["summary"]["errors"] 
+        - result["summary"]["skipped"]
+    )
+    return result
+
+
+def parse_cpp_test_report(report_path: Union[str, bytes], detailed: bool = True) -> Dict[str, object]:
+    """
+    Parse a C++ test report (gtest JSON, JUnit XML or CTest ``Test.xml``).
+
+    ``report_path`` may also be the raw report bytes, for callers that already read the file.
+    With ``detailed=False`` JUnit suites without failures, errors or skips are counted from
+    their attributes only and contribute no entries to ``tests``.
+    """
+    if isinstance(report_path, (bytes, bytearray)):
+        content = bytes(report_path)
+    else:
+        if not os.path.exists(report_path):
+            return {}
+        try:
+            with open(report_path, "rb") as f:
+                content = f.read()
+        except OSError as e:
+            logger.warning(f"Failed to read test report: {e}")
+            return {}
+
+    try:
+        if content.lstrip()[:1] in (b"{", b"["):
+            return _parse_cpp_json(content)
+        
+        if _xml_root_tag(content) == "Site":
+            # CTest dashboard file (Testing/<tag>/Test.xml)
+            result = _parse_ctest_site(content)
+        else:
+            result = _parse_junit_xml(ET.fromstring(content), detailed)
+        
+        result["summary"]["collected"] = result["summary"]["total"]
+        result["status"] = "passed" if (result["summary"]["failed"] + result["summary"]["errors"]) == 0 and result["summary"]["total"] > 0 else "failed"
+        
+        return result
+        
     except Exception as e:
         logger.warning(f"Failed to parse test report: {e}")
         return {}
 
 
-def _parse_cpp_json(content: str) -> Dict[str, object]:
+def _parse_cpp_json(content: bytes) -> Dict[str, object]:
     try:
         data = json.loads(content)
         
@@ -201,6 +455,10 @@ def _parse_cpp_json(content: str) -> Dict[str, object]:
 
 
 class CppDockerRepo(AbstractDockerRepo):
+
+    # image_name -> build tools found in that image, shared by all instances
+    _TOOLS_PRESENT: Dict[str, frozenset] = {}
+    _PROBED_TOOLS = ("cmake", "ctest", "make", "g++", "gcc")
     
     def __init__(self, 
                  repo: str, 
@@ -213,6 +471,36 @@ class CppDockerRepo(AbstractDockerRepo):
         super().__init__(repo=repo, base_commit=base_commit, default_cache_folder=default_cache_folder,
                          default_url=default_url, image_name=image_name, cache_mode=cache_mode)
     
+    def _tools_in_image(self) -> frozenset:
+        """Return the build tools available in ``self.image_name``, probing the container once per image."""
+        key = self.image_name
+        cached = self._TOOLS_PRESENT.get(key)
+        if cached is not None:
+            return cached
+        tools = " ".join(self._PROBED_TOOLS)
+        self.timeout_exec_run(
+            f"sh -c 'for t in {tools}; do command -v $t >/dev/null 2>&1 && echo $t; done'",
+            timeout=10
+        )
+        stdout = self.stdout if isinstance(self.stdout, bytes) else self.stdout.encode()
+        present = frozenset(stdout.decode("utf-8", errors="ignore").split())
+        self._TOOLS_PRESENT[key] = present
+        return present
+
+    def _probe_stdout(self, command: str, timeout: int) -> bytes:
+        """
+        Run a helper command and return its stdout.
+
+        timeout_exec_run stores its output on the instance, so the output and return
+        code of the main build/test command are restored afterwards.
+        """
+        saved = tuple(getattr(self, key, None) for key in ("stdout", "stderr", "std", "return_code"))
+        try:
+            self.timeout_exec_run(command, timeout=timeout)
+            return bytes(self.stdout)
+        finally:
+            self.stdout, self.stderr, self.std, self.return_code = saved
+
     @cached_property
     def _user_cpp_cache(self) -> str:
         return os.path.expanduser("~/.cache/cpp-build")
@@ -225,24 +513,24 @@ class CppDockerRepo(AbstractDockerRepo):
     def _local_cmake_cache(self) -> str:
         return os.path.join(self.cache_folder, ".cmake_cache")
     
-    def _setup_container_volumes(self, workdir: Optional[str] = None) -> Dict[str, Dict[str, str]]:
-        volumes = {}
-        if workdir:
-            volumes[self.cache_folder] = {"bind": workdir, "mode": "rw"}
+    @property
+    def _local_cache_dirs(self) -> Tuple[str, ...]:
+        return (self._local_cpp_cache, self._local_cmake_cache)
+
+    def _container_volumes(self, workdir: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+        volumes = super()._container_volumes(workdir)
         
         if self.cache_mode == "volume":
             self.create_volume("cpp-cache")
             self.create_volume("cmake-cache")
-            volumes["cpp-cache"] = {"bind": "/root/.cache/cpp", "mode": "rw"}
-            volumes["cmake-cache"] = {"bind": "/root/.cmake", "mode": "rw"}
+            volumes["cpp-cache"] = {"bind": "/root/.cache/cpp", "mode": self._CACHE_MOUNT_MODE}
+            volumes["cmake-cache"] = {"bind": "/root/.cmake", "mode": self._CACHE_MOUNT_MODE}
         elif self.cache_mode == "shared":
             if os.path.exists(self._user_cpp_cache):
-                volumes[self._user_cpp_cache] = {"bind": "/root/.cache/cpp-build", "mode": "rw"}
+                volumes[self._user_cpp_cache] = {"bind": "/root/.cache/cpp-build", "mode": self._CACHE_MOUNT_MODE}
         elif self.cache_mode == "local":
-            os.makedirs(self._local_cpp_cache, exist_ok=True)
-            os.makedirs(self._local_cmake_cache, exist_ok=True)
-            volumes[self._local_cpp_cache] = {"bind": "/root/.cache/cpp", "mode": "rw"}
-            volumes[self._local_cmake_cache] = {"bind": "/root/.cmake", "mode": "rw"}
+            volumes[self._local_cpp_cache] = {"bind": "/root/.cache/cpp", "mode": self._CACHE_MOUNT_MODE}
+            volumes[self._local_cmake_cache] = {"bind": "/root/.cmake", "mode": self._CACHE_MOUNT_MODE}
         
         return volumes
     
@@ -279,8 +567,7 @@ class CppDockerRepo(AbstractDockerRepo):
                            volumes=volumes, working_dir="/run_dir")
         
         try:
-            check_cmake = self.timeout_exec_run("sh -c 'which cmake'", timeout=10) or {}
-            if not check_cmake.get("stdout", b"").strip():
+            if "cmake" not in self._tools_in_image():
                 logger.info("Installing cmake and build tools")
                 install_cmd = "apt-get update -qq && apt-get install -y -qq cmake build-essential 2>/dev/null || apk add --no-cache cmake make g++ 2>/dev/null || yum install -y -q cmake gcc-c++ make 2>/dev/null"
                 self.timeout_exec_run(f"sh -c '{install_cmd}'", timeout=300)
@@ -288,14 +575,12 @@ class CppDockerRepo(AbstractDockerRepo):
             logger.warning(f"Failed to install cmake: {e}")
         
         try:
-            result = self.timeout_exec_run(
+            cmake_content = self._probe_stdout(
                 "sh -c 'cat /run_dir/CMakeLists.txt 2>/dev/null || echo \"\"'",
                 timeout=30
-            ) or {}
+            ).strip()
             
-            cmake_content = result.get("stdout", b"").decode("utf-8", errors="ignore")
-            
-            if cmake_content and "enable_testing" not in cmake_content.lower():
+            if cmake_content and b"enable_testing" not in cmake_content.lower():
                 logger.info("Adding enable_testing() to CMakeLists.txt")
                 self.timeout_exec_run(
                     "sh -c 'echo \"\" >> /run_dir/CMakeLists.txt && echo \"enable_testing()\" >> /run_dir/CMakeLists.txt'",
@@ -316,8 +601,7 @@ class CppDockerRepo(AbstractDockerRepo):
             self._convert_std_from_bytes_to_str()
         
         try:
-            check_build = self.timeout_exec_run("sh -c 'ls -la /run_dir/build 2>/dev/null | wc -l'", timeout=10) or {}
-            build_files = check_build.get("stdout", b"").decode("utf-8", errors="ignore").strip()
+            build_files = self._probe_stdout("sh -c 'ls -la /run_dir/build 2>/dev/null | wc -l'", timeout=10).strip()
             if build_files and int(build_files) > 3:
                 logger.info("Build directory exists with files, considering build successful")
                 self.return_code = 0
@@ -332,28 +616,6 @@ class CppDockerRepo(AbstractDockerRepo):
             self.stop_container()
         return self._format_results()
     
-    def _commit_container_image(self, retries: int = 3, delay: int = 10) -> None:
-        for attempt in range(retries):
-            try:
-                self.container.commit(self.default_image_name)
-                self.image_name = self.default_image_name
-                return
-            except APIError:
-                if attempt == retries - 1:
-                    raise
-                time.sleep(delay)
-    
-    def _image_exists(self, name: str) -> bool:
-        try:
-            self.docker_client.images.get(name)
-            return True
-        except (ImageNotFound, APIError):
-            return False
-    
-    @property
-    def was_build(self) -> bool:
-        return self._image_exists(self.default_image_name)
-    
     def __call__(self, command_build: str = "cmake -B build -DBUILD_GMOCK=ON -Dgtest_build_tests=ON -Dgmock_build_tests=ON && cmake --build build", command_test: str = "cd build && ctest --output-on-failure", timeout_build: int = DEFAULT_BUILD_TIMEOUT_INT,
                  timeout_test: int = DEFAULT_EVAL_TIMEOUT_INT) -> Dict[str, object]:
         if not self.was_build:
@@ -368,8 +630,7 @@ class CppDockerRepo(AbstractDockerRepo):
                            volumes=volumes, working_dir="/run_dir")
         
         try:
-            check_ctest = self.timeout_exec_run("sh -c 'which ctest'", timeout=10) or {}
-            if not check_ctest.get("stdout", b"").strip():
+            if "ctest" not in self._tools_in_image():
                 logger.info("Installing cmake for tests")
                 install_cmd = "apt-get update -qq && apt-get install -y -qq cmake 2>/dev/null || apk add --no-cache cmake 2>/dev/null || yum install -y -q cmake 2>/dev/null"
                 self.timeout_exec_run(f"sh -c '{install_cmd}'", timeout=300)
@@ -397,19 +658,10 @@ class CppDockerRepo(AbstractDockerRepo):
         
         all_report_files = set()
         report_dir = os.path.join(self.cache_folder, "test-results")
-        if os.path.exists(report_dir) and os.path.isdir(report_dir):
-            for filename in os.listdir(report_dir):
-                if filename.endswith((".json", ".xml")):
-                    all_report_files.add(os.path.join(report_dir, filename))
-        
+        all_report_files.update(scan_report_files(report_dir, _REPORT_EXTS))
+
         testing_dir = os.path.join(self.cache_folder, "build", "Testing")
-        if os.path.exists(testing_dir) and os.path.isdir(testing_dir):
-            for subdir in os.listdir(testing_dir):
-                subdir_path = os.path.join(testing_dir, subdir)
-                if os.path.isdir(subdir_path):
-                    test_xml = os.path.join(subdir_path, "Test.xml")
-                    if os.path.exists(test_xml):
-                        all_report_files.add(test_xml)
+        all_report_files.update(_scan_ctest_xml_files(testing_dir))
         
         known_paths = [
             os.path.join(self.cache_folder, "ctest_results.xml"),
@@ -421,8 +673,22 @@ class CppDockerRepo(AbstractDockerRepo):
                 all_report_files.add(report_path)
 
         parsed_reports = []
-        for report_file in all_report_files:
-            parsed_report = parse_cpp_test_report(report_file)
+        # path -> (mtime, size) of the version already parsed, so the fallbacks
+        # below only parse report files that are new or were rewritten.
+        parsed_paths = {}
+
+        def _ingest(report_file: str) -> None:
+            try:
+                with open(report_file, "rb") as f:
+                    stat = os.fstat(f.fileno())
+                    signature = (stat.st_mtime_ns, stat.st_size)
+                    if parsed_paths.get(report_file) == signature:
+                        return
+                    content = f.read()
+            except OSError:
+                return
+            parsed_paths[report_file] = signature
+            parsed_report = parse_cpp_test_report(content)
             if isinstance(parsed_report, dict):
                 summary = parsed_report.get("summary", {})
                 if isinstance(summary, dict):
@@ -432,38 +698,33 @@ class CppDockerRepo(AbstractDockerRepo):
                 if total > 0:
                     parsed_reports.append(parsed_report)
 
+        for report_file in all_report_files:
+            _ingest(report_file)
+
         test_results = self._merge_reports(parsed_reports)
         
         if not test_results or test_results.get("summary", {}).get("total", 0) == 0:
             logger.info("No tests found via ctest, checking if tests were built")
             try:
-                check_cmake_cache = self.timeout_exec_run(
+                cache_content = self._probe_stdout(
                     "sh -c 'grep -i \"gtest_build_tests\\|gmock_build_tests\" /run_dir/build/CMakeCache.txt 2>/dev/null || echo NOTFOUND'",
                     timeout=10
-                ) or {}
-                cache_content = check_cmake_cache.get("stdout", b"").decode("utf-8", errors="ignore")
+                )
                 
-                if "NOTFOUND" in cache_content or "OFF" in cache_content:
+                if b"NOTFOUND" in cache_content or b"OFF" in cache_content:
                     logger.info("Tests were not built with proper flags, rebuilding...")
                     try:
                         rebuild_cmd = "cd /run_dir && cmake -B build -DBUILD_GMOCK=ON -Dgtest_build_tests=ON -Dgmock_build_tests=ON && cmake --build build"
                         self.timeout_exec_run(f"sh -c '{rebuild_cmd}'", timeout=600)
                         
-                        retry_test = self.timeout_exec_run(
+                        self.timeout_exec_run(
                             f"sh -c 'cd /run_dir/build && ctest --output-on-failure'",
                             timeout=300
                         )
                         
                         testing_dir = os.path.join(self.cache_folder, "build", "Testing")
-                        if os.path.exists(testing_dir) and os.path.isdir(testing_dir):
-                            for subdir in os.listdir(testing_dir):
-                                subdir_path = os.path.join(testing_dir, subdir)
-                                if os.path.isdir(subdir_path):
-                                    test_xml = os.path.join(subdir_path, "Test.xml")
-                                    if os.path.exists(test_xml):
-                                        parsed_report = parse_cpp_test_report(test_xml)
-                                        if parsed_report.get("summary", {}).get("total", 0) > 0:
-                                            parsed_reports.append(parsed_report)
+                        for test_xml in _scan_ctest_xml_files(testing_dir):
+                            _ingest(test_xml)
                         
                         if parsed_reports:
                             test_results = self._merge_reports(parsed_reports)
@@ -475,71 +736,50 @@ class CppDockerRepo(AbstractDockerRepo):
             if not test_results or test_results.get("summary", {}).get("total", 0) == 0:
                 logger.info("Still no tests found, trying to find and run test binaries")
                 try:
-                    find_result = self.timeout_exec_run(
+                    found = self._probe_stdout(
                         "sh -c 'find /run_dir/build -type f -executable -name \"*test*\" 2>/dev/null | grep -v CMake | head -20'",
                         timeout=30
-                    ) or {}
+                    )
                     
-                    test_binaries = find_result.get("stdout", b"").decode("utf-8", errors="ignore").strip().split('\n')
-                    test_binaries = [t.strip() for t in test_binaries if t.strip() and 'test' in t.lower() and not t.endswith('.cmake')]
+                    # Filter on the raw bytes and decode only the selected paths
+                    test_binaries = [
+                        line.decode("utf-8", errors="ignore")
+                        for line in (raw.strip() for raw in found.splitlines())
+                        if line and b"test" in line.lower() and not line.endswith(b".cmake")
+                    ]
+                    test_binaries = _dedupe_test_binaries(test_binaries, limit=_MAX_TEST_BINARIES, host_dir=self.cache_folder)
                     
                     if test_binaries:
                         logger.info(f"Found {len(test_binaries)} test binaries")
                         
-                        result = {
-                            "tests": [],
-                            "summary": {"total": 0, "passed": 0, "failed": 0, "skipped": 0, "errors": 0, "collected": 0}
-                        }
+                        # One exec for all binaries: they run concurrently and each
+                        # reports its exit code as a marker line on stdout.
+                        report_dir = os.path.join(self.cache_folder, "test-results")
+                        result = None
+                        try:
+                            logger.info(f"Running test binaries: {', '.join(test_binaries)}")
+                            self.timeout_exec_run(
+                                f"sh -c '{_batched_binaries_command(test_binaries)}'",
+                                timeout=60
+                            )
+                            result = _binary_results(test_binaries, bytes(self.stdout), report_dir)
+                        except TimeOutException:
+                            # self.stdout holds the partial output: binaries that finished
+                            # before the timeout already printed their exit marker
+                            logger.warning("Test binaries timed out, unfinished ones are reported as failed")
+                            result = _binary_results(test_binaries, bytes(self.stdout), report_dir)
+                        except Exception as e:
+                            logger.warning(f"Failed to run test binaries: {e}")
                         
-                        for binary in test_binaries[:10]:
+                        for json_path in scan_report_files(report_dir, _JSON_EXTS):
                             try:
-                                logger.info(f"Running test binary: {binary}")
-                                test_output = self.timeout_exec_run(
-                                    f"sh -c 'cd /run_dir/build && {binary} --gtest_output=json:/run_dir/test-results/{os.path.basename(binary)}.json 2>&1 || {binary} 2>&1'",
-                                    timeout=60
-                                ) or {}
-                                
-                                result["summary"]["total"] += 1
-                                
-                                test_returncode = test_output.get("returncode", 1)
-                                if test_returncode == 0:
-                                    result["summary"]["passed"] += 1
-                                    result["tests"].append({
-                                        "name": os.path.basename(binary),
-                                        "classname": "binary_test",
-                                        "time": 0.0,
-                                        "status": "passed"
-                                    })
-                                else:
-                                    result["summary"]["failed"] += 1
-                                    result["tests"].append({
-                                        "name": os.path.basename(binary),
-                                        "classname": "binary_test",
-                                        "time": 0.0,
-                                        "status": "failed",
-                                        "message": test_output.get("stderr", b"").decode("utf-8", errors="ignore")[:200]
-                                    })
-                            except Exception as e:
-                                logger.warning(f"Failed to run binary {binary}: {e}")
-                        
-                        result["summary"]["collected"] = result["summary"]["total"]
-                        result["status"] = "passed" if result["summary"]["failed"] == 0 else "failed"
-                        
-                        report_dir = os.path.join(self.cache_folder, "test-results")
-                        if os.path.exists(report_dir):
-                            for filename in os.listdir(report_dir):
-                                if filename.endswith(".json"):
-                                    json_path = os.path.join(report_dir, filename)
-                                    try:
-                                        json_report = parse_cpp_test_report(json_path)
-                                        if json_report.get("summary", {}).get("total", 0) > 0:
-                                            parsed_reports.append(json_report)
-                                    except Exception:
-                                        pass
+                                _ingest(json_path)
+                            except Exception:
+                                pass
                         
                         if parsed_reports:
                             test_results = self._merge_reports(parsed_reports)
-                        else:
+                        elif result is not None:
                             test_results = result
                             
                 except Exception as e:
@@ -555,15 +795,19 @@ class CppDockerRepo(AbstractDockerRepo):
         if stop_container:
             self.stop_container()
         
+        # The fallback runs above leave their own output as bytes
+        self._convert_std_from_bytes_to_str()
         return self._format_results(test_json=test_results)
     
     def _format_results(self, test_json: Optional[Dict] = None) -> Dict[str, object]:
-        default_result = {
-            "tests": [],
-            "summary": {"total": 0, "passed": 0, "failed": 0, "skipped": 0, "errors": 0, "collected": 0},
-            "status": "unknown"
-        }
-        parser_result = test_json or default_result
+        if test_json:
+            parser_result = test_json
+        else:
+            parser_result = {
+                "tests": [],
+                "summary": {"total": 0, "passed": 0, "failed": 0, "skipped": 0, "errors": 0, "collected": 0},
+                "status": "unknown"
+            }
         
         return {
             "stdout": self.stdout,
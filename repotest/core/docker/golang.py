@@ -1,100 +1,169 @@
 import json
 import logging
+import mmap
 import os
+import shlex
+import stat
 import time
-from functools import cached_property
-from typing import Dict, Optional
-from docker.errors import APIError, ImageNotFound
+from collections import Counter
+from concurrent.futures.process import BrokenProcessPool
+from functools import cached_property, partial
+from itertools import repeat
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
 from repotest.constants import DEFAULT_BUILD_TIMEOUT_INT, DEFAULT_CACHE_FOLDER, DEFAULT_EVAL_TIMEOUT_INT
 from repotest.core.docker.base import AbstractDockerRepo
+from repotest.core.docker.report_files import first_non_space_byte, parse_pool, parse_workers
 from repotest.core.exceptions import TimeOutException
 from repotest.core.docker.types import CacheMode
 
 logger = logging.getLogger("repotest")
 
-def parse_go_test_report(report_path: str) -> Dict[str, object]:
-    if not os.path.exists(report_path):
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+_GO_STATUS_MAP = {"pass": "passed", "fail": "failed", "skip": "skipped"}
+_GO_TEST_KEY = b'"Test":"'
+_GO_TEST_KEY_LEN = len(_GO_TEST_KEY)
+_GO_ACTION_KEY = b'"Action":"'
+_GO_ACTION_KEY_LEN = len(_GO_ACTION_KEY)
+# Action value plus its closing quote -> terminal action, e.g. b'pass"' -> "pass"
+_GO_TERMINAL_ACTION_BYTES = {action.encode() + b'"': action for action in _GO_STATUS_MAP}
+
+_GO_TEST_JSON_NAME = "go-test.json"
+_GO_JUNIT_XML_NAME = "junit.xml"
+
+# Stored as bytes on timeout; _convert_std_from_bytes_to_str decodes it with the rest
+_TIMEOUT_STDERR = b"Timeout exception"
+
+# Characters that make a command need a shell (pipes, lists, redirects, expansion, env assignments)
+_SHELL_SYNTAX = frozenset("|&;<>()$`\\\"'*?[]{}~#=%\n")
+
+_STREAM_BUFFER_SIZE = 1 << 20
+_MMAP_THRESHOLD = 16 * 1024 * 1024
+# Below this size starting the workers and pickling the partial results costs more
+# than a process pool saves (a forkserver/spawn worker takes ~0.5s to start)
+_PARALLEL_PARSE_THRESHOLD = 64 * 1024 * 1024
+
+def _exec_argv(command: str) -> List[str]:
+    """
+    argv for ``exec_run``: a plain command runs directly, anything needing shell
+    syntax goes through ``sh -c`` as a single argument (no extra quoting layer).
+    """
+    if _SHELL_SYNTAX.isdisjoint(command):
+        return shlex.split(command)
+    return ["sh", "-c", command]
+
+def parse_go_test_report(report_path: str, summary_only: bool = False,
+                         state: Optional[Dict[str, object]] = None) -> Dict[str, object]:
+    """
+    Parse a ``go test -json`` stream or a JUnit XML report.
+
+    With ``summary_only=True`` a JSON stream is only counted (see ``_parse_go_json_summary``)
+    and the returned ``tests`` list is empty. ``state`` is passed on to ``_parse_go_json``.
+    """
+    try:
+        f = open(report_path, "rb", buffering=_STREAM_BUFFER_SIZE)
+    except FileNotFoundError:
+        return {}
+    except OSError as e:
+        logger.warning(f"Failed to open test report: {e}")
         return {}
     
-    try:
-        with open(report_path, "r") as f:
-            content = f.read()
-            
-            if content.strip().startswith("{") or content.strip().startswith("["):
-                return _parse_go_json(content)
-            
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(content)
-            
-            result = {
-                "tests": [],
-                "summary": {
-                    "total": 0,
-                    "passed": 0,
-                    "failed": 0,
-                    "skipped": 0,
-                    "errors": 0,
-                    "collected": 0
-                }
-            }
-            
-            testsuites = root.findall(".//testsuite")
-            if not testsuites and root.tag == "testsuite":
-                testsuites = [root]
-            
-            for testsuite in testsuites:
-                result["summary"]["total"] += int(testsuite.get("tests", 0))
-                result["summary"]["failed"] += int(testsuite.get("failures", 0))
-                result["summary"]["errors"] += int(testsuite.get("errors", 0))
-                result["summary"]["skipped"] += int(testsuite.get("skipped", 0))
-                
-                for testcase in testsuite.findall("testcase"):
-                    test_info = {
-                        "name": testcase.get("name"),
-                        "classname": testcase.get("classname"),
-                        "time": float(testcase.get("time", 0)),
-                        "status": "passed"
-                    }
-                    
-                    failure = testcase.find("failure")
-                    error = testcase.find("error")
-                    skipped = testcase.find("skipped")
-                    
-                    if failure is not None:
-                        test_info["status"] = "failed"
-                        test_info["message"] = failure.get("message", "")
-                        test_info["details"] = failure.text or ""
-                    elif error is not None:
-                        test_info["status"] = "error"
-                        test_info["message"] = error.get("message", "")
-                        test_info["details"] = error.text or ""
-                    elif skipped is not None:
-                        test_info["status"] = "skipped"
-                        test_info["message"] = skipped.get("message", "")
-                    
-                    result["tests"].append(test_info)
-            
-            result["summary"]["passed"] = (
-                result["summary"]["total"] 
-                - result["summary"]["failed"] 
-                - result["summary"]["errors"] 
-                - result["summary"]["skipped"]
-            )
-            result["summary"]["collected"] = result["summary"]["total"]
-            result["status"] = "passed" if (result["summary"]["failed"] + result["summary"]["errors"]) == 0 else "failed"
-            
-            return result
+    with f:
+        try:
+            first = first_non_space_byte(f)
+            if not first:
+                # Empty report (e.g. the build failed before any test ran)
+                return {}
+            if first in (b"{", b"["):
+                size = os.fstat(f.fileno()).st_size
+                if summary_only:
+                    parse = _parse_go_json_summary
+                elif size >= _PARALLEL_PARSE_THRESHOLD and parse_workers() > 1:
+                    return _parse_go_json_parallel(report_path, size, state=state)
+                else:
+                    parse = partial(_parse_go_json, state=state)
+                # go test -json output is parsed line by line straight from the file;
+                # big files are walked through a read-only mapping of the page cache
+                if size >= _MMAP_THRESHOLD:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    try:
+                        return parse(iter(mm.readline, b""))
+                    finally:
+                        mm.close()
+                return parse(f)
             
-    except Exception as e:
-        logger.warning(f"Failed to parse test report: {e}")
-        return {}
+            return _parse_go_junit_xml(f, report_path)
+        except OSError as e:
+            logger.warning(f"Failed to read test report {report_path}: {e}")
+            return {}
+
+
+def _add_junit_counts(summary: Dict[str, int], total: int, failed: int, errors: int, skipped: int) -> None:
+    summary["total"] += total
+    summary["failed"] += failed
+    summary["errors"] += errors
+    summary["skipped"] += skipped
 
-def _parse_go_json(content: str) -> Dict[str, object]:
-    lines = content.strip().split('\n')
+
+def _parse_junit_testcase(elem) -> Dict[str, object]:
+    test_info = {
+        "name": elem.get("name"),
+        "classname": elem.get("classname"),
+        "time": float(elem.get("time", 0)),
+        "status": "passed"
+    }
     
-    packages = {}
-    tests = {}
+    # One pass over the children instead of three find() path lookups;
+    # the first element of each kind wins, as with find()
+    failure = error = skipped = None
+    for child in elem:
+        child_tag = child.tag
+        if child_tag == "failure":
+            if failure is None:
+                failure = child
+        elif child_tag == "error":
+            if error is None:
+                error = child
+        elif child_tag == "skipped":
+            if skipped is None:
+                skipped = child
     
+    if failure is not None:
+        test_info["status"] = "failed"
+        test_info["message"] = failure.get("message", "")
+        test_info["details"] = failure.text or ""
+    elif error is not None:
+        test_info["status"] = "error"
+        test_info["message"] = error.get("message", "")
+        test_info["details"] = error.text or ""
+    elif skipped is not None:
+        test_info["status"] = "skipped"
+        test_info["message"] = skipped.get("message", "")
+    return test_info
+
+
+def _parse_go_junit_xml(f: BinaryIO, report_path: str) -> Dict[str, object]:
+    """
+    Parse a JUnit XML report (go-junit-report) from the binary file ``f``.
+
+    lxml is used when installed, stdlib ElementTree otherwise. The report is streamed with
+    iterparse: every <testcase> is read at its end tag and then cleared, so memory stays
+    bounded by one test case rather than the whole tree.
+
+    A report cut short (e.g. the run timed out mid-write) keeps the test cases read so far;
+    those not covered by a closed <testsuite> are counted from their own statuses. A test
+    case with unreadable attributes becomes an "error" entry instead of failing the report,
+    and its suite is then counted from its test cases' statuses as well.
+    """
     result = {
         "tests": [],
         "summary": {
@@ -106,67 +175,409 @@ def _parse_go_json(content: str) -> Dict[str, object]:
             "collected": 0
         }
     }
+    summary = result["summary"]
+    tests = result["tests"]
+    
+    # One frame per open <testsuite> (plus one for cases outside any suite):
+    # [statuses of its own test cases, has nested suites, has unreadable test cases]
+    frames = [[Counter(), False, False]]
+    try:
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                if tag == "testsuite":
+                    frames[-1][1] = True
+                    frames.append([Counter(), False, False])
+                continue
+            
+            if tag == "testcase":
+                try:
+                    test_info = _parse_junit_testcase(elem)
+                except ValueError as e:
+                    test_info = {
+                        "name": elem.get("name"),
+                        "classname": elem.get("classname"),
+                        "time": 0,
+                        "status": "error",
+                        "message": f"Unreadable test case: {e}"
+                    }
+                    frames[-1][2] = True
+                tests.append(test_info)
+                frames[-1][0][test_info["status"]] += 1
+            elif tag == "testsuite":
+                statuses, nested, unreadable = frames.pop()
+                counts = None
+                # The suite counters are used only when they cover exactly this suite's
+                # test cases: not for an outer suite (its counters already include the
+                # nested ones) nor when one of its test cases had to be turned into an error
+                if not nested and not unreadable:
+                    try:
+                        counts = (int(elem.get("tests", 0)), int(elem.get("failures", 0)),
+                                  int(elem.get("errors", 0)), int(elem.get("skipped", 0)))
+                    except ValueError as e:
+                        logger.warning(f"Bad counters on testsuite {elem.get('name')!r} in {report_path}: {e}")
+                if counts is not None:
+                    _add_junit_counts(summary, *counts)
+                else:
+                    # Count this suite's own test cases from their statuses
+                    frames[-1][0].update(statuses)
+            else:
+                continue
+            
+            elem.clear()
+            if hasattr(elem, "getprevious"):
+                # lxml keeps cleared siblings linked to the parent; drop them too
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+    except ET.ParseError as e:
+        if not tests:
+            logger.warning(f"Failed to parse test report {report_path}: {e}")
+            return {}
+        logger.warning(f"Truncated or malformed test report {report_path}, "
+                       f"keeping {len(tests)} test cases read before the error: {e}")
+    
+    # Test cases not accounted for by a closed <testsuite> (e.g. in suites left open
+    # by a truncated report) are counted from their own statuses
+    pending = Counter()
+    for statuses, _, _ in frames:
+        pending.update(statuses)
+    if pending:
+        _add_junit_counts(summary, sum(pending.values()), pending["failed"],
+                          pending["error"], pending["skipped"])
     
-    status_map = {"pass": "passed", "fail": "failed", "skip": "skipped"}
+    summary["passed"] = (
+        summary["total"] 
+        - summary["failed"] 
+        - summary["errors"] 
+        - summary["skipped"]
+    )
+    summary["collected"] = summary["total"]
+    result["status"] = "passed" if (summary["failed"] + summary["errors"]) == 0 else "failed"
+    
+    return result
+
+def _parse_go_json(content: Union[str, bytes, Iterable[bytes]], state: Optional[Dict[str, object]] = None) -> Dict[str, object]:
+    """
+    Parse ``go test -json`` events given as a whole buffer or as an iterable of lines (e.g. a binary file).
+
+    ``state`` is an optional ``{"tests": _new_go_test_table(), "test_actions": []}`` scratch pool
+    reused across calls; it is cleared before and after parsing. ``packages`` is always fresh,
+    as it is returned.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    if isinstance(content, bytes):
+        if not content or content.isspace():
+            return _empty_go_result()
+        # No whole-buffer strip(): blank lines are skipped one by one below
+        lines = content.splitlines()
+    else:
+        lines = content
+    
+    packages = {}
+    if state is None:
+        tests = _new_go_test_table()
+        # Actions of terminal test events, counted in one pass after the loop
+        test_actions = []
+    else:
+        tests = state["tests"]
+        test_actions = state["test_actions"]
+        _clear_go_test_table(tests)
+        test_actions.clear()
+    
+    _scan_go_events(lines, packages, tests, test_actions)
+    
+    result = _build_go_result(test_actions, _finalize_go_tests(tests), packages)
+    if state is not None:
+        # Release this run's tests; the emptied containers are reused next time
+        _clear_go_test_table(tests)
+        test_actions.clear()
+    return result
+
+
+def _empty_go_result() -> Dict[str, object]:
+    """What ``_parse_go_json`` returns for empty input, built without scanning anything."""
+    return {
+        "tests": [],
+        "summary": {"total": 0, "passed": 0, "failed": 0, "skipped": 0, "errors": 0, "collected": 0},
+        "status": "unknown",
+        "packages": {}
+    }
+
+
+def _new_go_test_table() -> Dict[str, object]:
+    """
+    Column store for the tests seen by ``_scan_go_events``.
+
+    ``index`` maps ``(package, test)`` to a row; ``status``, ``time`` and ``output`` are
+    parallel lists holding that row's fields, so a test costs three list slots rather
+    than a dict of its own until ``_finalize_go_tests`` builds the result records.
+    """
+    return {"index": {}, "status": [], "time": [], "output": []}
+
+
+def _clear_go_test_table(tests: Dict[str, object]) -> None:
+    for column in tests.values():
+        column.clear()
+
+
+def _scan_go_events(lines: Iterable[bytes], packages: Dict[str, Dict],
+                    tests: Dict[str, object], test_actions: List[str]) -> None:
+    """Fold ``go test -json`` event lines into ``packages``, ``tests`` and ``test_actions`` in place."""
+    # Everything the loop touches per event is bound to a local once
+    loads = _json_loads
+    status_for = _GO_STATUS_MAP.get
+    test_index = tests["index"]
+    row_of = test_index.get
+    statuses = tests["status"]
+    times = tests["time"]
+    outputs = tests["output"]
+    add_action = test_actions.append
+    package_of = packages.get
+    share_name = {}.setdefault
     
     for line in lines:
-        if not line.strip():
+        if not line or line.isspace():
             continue
         try:
-            event = json.loads(line)
-            action = event.get("Action", "")
-            package = event.get("Package", "")
-            test = event.get("Test", "")
-            elapsed = event.get("Elapsed", 0)
-            
-            if package and not test:
-                if package not in packages:
-                    packages[package] = {
-                        "name": package,
-                        "status": None,
-                        "elapsed": 0
-                    }
-                if action in status_map:
-                    packages[package]["status"] = status_map[action]
-                    packages[package]["elapsed"] = elapsed
-            
-            if test:
-                test_key = f"{package}/{test}"
-                if test_key not in tests:
-                    tests[test_key] = {
-                        "name": test,
-                        "classname": package,
-                        "time": 0,
-                        "status": "unknown",
-                        "output": []
-                    }
-                
-                if action == "pass":
-                    tests[test_key]["status"] = "passed"
-                    tests[test_key]["time"] = elapsed
-                    result["summary"]["passed"] += 1
-                    result["summary"]["total"] += 1
-                elif action == "fail":
-                    tests[test_key]["status"] = "failed"
-                    tests[test_key]["time"] = elapsed
-                    result["summary"]["failed"] += 1
-                    result["summary"]["total"] += 1
-                elif action == "skip":
-                    tests[test_key]["status"] = "skipped"
-                    tests[test_key]["time"] = elapsed
-                    result["summary"]["skipped"] += 1
-                    result["summary"]["total"] += 1
-                elif action == "output" and "Output" in event:
-                    tests[test_key]["output"].append(event["Output"])
+            event = loads(line)
+        except ValueError:
+            # json.JSONDecodeError and orjson.JSONDecodeError are both ValueErrors
+            continue
+        if not isinstance(event, dict):
+            # Valid JSON that is not an event (e.g. a stray array or number)
+            continue
+        get = event.get
+        action = get("Action", "")
+        package = get("Package", "")
+        test = get("Test", "")
+        # pass/fail/skip -> result status, None for every other action
+        status = status_for(action)
         
-        except json.JSONDecodeError:
+        # Test events outnumber package events, so they are dispatched first
+        if test:
+            test_key = (package, test)
+            row = row_of(test_key)
+            if row is None:
+                # Every record of a package points at one shared classname string
+                test_key = (share_name(package, package), test)
+                row = test_index[test_key] = len(statuses)
+                statuses.append("unknown")
+                times.append(0)
+                outputs.append(None)
+            
+            if status is not None:
+                statuses[row] = status
+                times[row] = get("Elapsed", 0)
+                add_action(action)
+            elif action == "output":
+                text = get("Output")
+                if text is not None:
+                    output = outputs[row]
+                    if output is None:
+                        outputs[row] = [text]
+                    else:
+                        output.append(text)
+        elif package:
+            package_info = package_of(package)
+            if package_info is None:
+                package_info = packages[package] = {
+                    "name": package,
+                    "status": None,
+                    "elapsed": 0
+                }
+            if status is not None:
+                package_info["status"] = status
+                package_info["elapsed"] = get("Elapsed", 0)
+
+
+def _finalize_go_tests(tests: Dict[str, object]) -> List[Dict]:
+    """Build one result record per row of the ``tests`` table, in first-seen order."""
+    # Each record is created once, at its final size, straight into a pre-sized list
+    test_list = [None] * len(tests["status"])
+    rows = zip(tests["index"], tests["status"], tests["time"], tests["output"])
+    for row, ((package, test), status, elapsed, output) in enumerate(rows):
+        if output:
+            # The joined output is the record's message; details shares the same str
+            message = "".join(output)
+            test_list[row] = {
+                "name": test,
+                "classname": package,
+                "time": elapsed,
+                "status": status,
+                "output": output,
+                "message": message,
+                "details": message
+            }
+        else:
+            test_list[row] = {
+                "name": test,
+                "classname": package,
+                "time": elapsed,
+                "status": status,
+                "output": []
+            }
+    return test_list
+
+
+def _scan_go_json_range(report_path: str, start: int, end: int) -> tuple:
+    """Worker of ``_parse_go_json_parallel``: scan the lines of ``report_path[start:end]``."""
+    with open(report_path, "rb") as f:
+        f.seek(start)
+        content = f.read(end - start)
+    packages = {}
+    tests = _new_go_test_table()
+    test_actions = []
+    _scan_go_events(content.splitlines(), packages, tests, test_actions)
+    return packages, tests, test_actions
+
+
+def _split_on_newlines(report_path: str, size: int, parts: int) -> List[tuple]:
+    """Cut ``report_path`` into about ``parts`` byte ranges that end on line boundaries."""
+    bounds = [0]
+    with open(report_path, "rb") as f:
+        for i in range(1, parts):
+            target = max(size * i // parts, bounds[-1])
+            f.seek(target)
+            f.readline()
+            cut = f.tell()
+            if cut >= size:
+                break
+            if cut > bounds[-1]:
+                bounds.append(cut)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _parse_go_json_parallel(report_path: str, size: int, workers: Optional[int] = None,
+                            state: Optional[Dict[str, object]] = None) -> Dict[str, object]:
+    """
+    ``_parse_go_json`` for huge ``go test -json`` files, spread over a process pool.
+
+    Each worker scans a newline-aligned byte range of the file; the partial results are
+    folded back in file order, so a test whose events straddle two ranges ends up with
+    the same status, time and output as with the serial parser. ``state`` is only used
+    when the file ends up parsed serially.
+    """
+    if workers is None:
+        workers = parse_workers()
+    ranges = _split_on_newlines(report_path, size, workers)
+    if len(ranges) < 2:
+        with open(report_path, "rb", buffering=_STREAM_BUFFER_SIZE) as f:
+            return _parse_go_json(f, state=state)
+    
+    try:
+        with parse_pool(len(ranges)) as pool:
+            chunks = list(pool.map(_scan_go_json_range, repeat(report_path),
+                                   [start for start, _ in ranges], [end for _, end in ranges]))
+    except (OSError, BrokenProcessPool) as e:
+        # No worker processes available (e.g. fork refused); parse in this process
+        logger.warning(f"Parallel parse of {report_path} failed, parsing serially: {e}")
+        with open(report_path, "rb", buffering=_STREAM_BUFFER_SIZE) as f:
+            return _parse_go_json(f, state=state)
+    
+    packages = {}
+    tests = _new_go_test_table()
+    test_index = tests["index"]
+    statuses = tests["status"]
+    times = tests["time"]
+    outputs = []
+    test_actions = []
+    for chunk_packages, chunk_tests, chunk_actions in chunks:
+        for name, package_info in chunk_packages.items():
+            known = packages.get(name)
+            if known is None:
+                packages[name] = package_info
+            elif package_info["status"] is not None:
+                known["status"] = package_info["status"]
+                known["elapsed"] = package_info["elapsed"]
+        for test_key, status, elapsed, output in zip(chunk_tests["index"], chunk_tests["status"],
+                                                     chunk_tests["time"], chunk_tests["output"]):
+            row = test_index.get(test_key)
+            if row is None:
+                row = test_index[test_key] = len(statuses)
+                statuses.append(status)
+                times.append(elapsed)
+                outputs.append([])
+            elif status != "unknown":
+                statuses[row] = status
+                times[row] = elapsed
+            if output is not None:
+                outputs[row].extend(output)
+        test_actions.extend(chunk_actions)
+    
+    tests["output"] = outputs
+    
+    return _build_go_result(test_actions, _finalize_go_tests(tests), packages)
+
+
+def _parse_go_json_summary(lines: Iterable[bytes]) -> Dict[str, object]:
+    """
+    Summary-only variant of ``_parse_go_json``: same ``summary``/``status``/``packages``, empty ``tests``.
+
+    Test events in test2json's compact layout (``"Test":"..."``, ``"Action":"..."``) are
+    classified by substring search instead of JSON decoding. A quote inside a string value
+    is always escaped, so these byte sequences can only be real keys. Every other line,
+    including test events written with spaces after the separators, is decoded as usual.
+    """
+    packages = {}
+    test_actions = []
+    append = test_actions.append
+    
+    for line in lines:
+        test_pos = line.find(_GO_TEST_KEY)
+        if test_pos >= 0 and line[test_pos + _GO_TEST_KEY_LEN:test_pos + _GO_TEST_KEY_LEN + 1] != b'"':
+            # One search for the key, then a dict lookup on the 5 bytes after it
+            start = line.find(_GO_ACTION_KEY)
+            if start >= 0:
+                start += _GO_ACTION_KEY_LEN
+                action = _GO_TERMINAL_ACTION_BYTES.get(line[start:start + 5])
+                if action is not None:
+                    append(action)
+                continue
+        if not line or line.isspace():
+            continue
+        try:
+            event = _json_loads(line)
+        except ValueError:
+            continue
+        if not isinstance(event, dict):
+            continue
+        action = event.get("Action", "")
+        if event.get("Test", ""):
+            if action in _GO_STATUS_MAP:
+                append(action)
             continue
+        package = event.get("Package", "")
+        if package:
+            package_info = packages.get(package)
+            if package_info is None:
+                package_info = packages[package] = {
+                    "name": package,
+                    "status": None,
+                    "elapsed": 0
+                }
+            status = _GO_STATUS_MAP.get(action)
+            if status is not None:
+                package_info["status"] = status
+                package_info["elapsed"] = event.get("Elapsed", 0)
     
-    for test_info in tests.values():
-        if test_info.get("output"):
-            test_info["message"] = "".join(test_info["output"])
-            test_info["details"] = test_info["message"]
-        result["tests"].append(test_info)
+    return _build_go_result(test_actions, [], packages)
+
+
+def _build_go_result(test_actions: List[str], tests: List[Dict], packages: Dict[str, Dict]) -> Dict[str, object]:
+    action_counts = Counter(test_actions)
+    result = {
+        "tests": tests,
+        "summary": {
+            "total": len(test_actions),
+            "passed": action_counts["pass"],
+            "failed": action_counts["fail"],
+            "skipped": action_counts["skip"],
+            "errors": 0,
+            "collected": 0
+        }
+    }
     
     if result["summary"]["total"] > 0:
         result["status"] = "passed" if result["summary"]["failed"] == 0 else "failed"
@@ -204,6 +615,11 @@ class GoLangDockerRepo(AbstractDockerRepo):
                 ) -> None:
         super().__init__(repo=repo, base_commit=base_commit, default_cache_folder=default_cache_folder,
                          default_url=default_url, image_name=image_name, cache_mode=cache_mode)
+        # Also produce test-results/junit.xml with go-junit-report (when the image has it)
+        # for runs whose go test -json stream contains no test events
+        self.enable_junit_fallback = False
+        # Scratch containers for _parse_go_json, reused by every run_test call
+        self._parser_state = {"tests": _new_go_test_table(), "test_actions": []}
     
     @cached_property
     def _user_go_cache(self) -> str:
@@ -217,10 +633,12 @@ class GoLangDockerRepo(AbstractDockerRepo):
     def _local_gomod_cache(self) -> str:
         return os.path.join(self.cache_folder, ".gomod_cache")
     
-    def _setup_container_volumes(self, workdir: Optional[str] = None) -> Dict[str, Dict[str, str]]:
-        volumes = {}
-        if workdir:
-            volumes[self.cache_folder] = {"bind": workdir, "mode": "rw"}
+    @property
+    def _local_cache_dirs(self) -> Tuple[str, ...]:
+        return (self._local_go_cache, self._local_gomod_cache)
+    
+    def _container_volumes(self, workdir: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+        volumes = super()._container_volumes(workdir)
         
         if self.cache_mode == "volume":
             self.create_volume("go-cache")
@@ -229,12 +647,10 @@ class GoLangDockerRepo(AbstractDockerRepo):
             volumes["gomod-cache"] = {"bind": "/root/.cache/go-build", "mode": "rw"}
         elif self.cache_mode == "shared":
             if os.path.exists(self._user_go_cache):
-                volumes[self._user_go_cache] = {"bind": "/root/.cache/go-build", "mode": "rw"}
+                volumes[self._user_go_cache] = {"bind": "/root/.cache/go-build", "mode": self._CACHE_MOUNT_MODE}
         elif self.cache_mode == "local":
-            os.makedirs(self._local_go_cache, exist_ok=True)
-            os.makedirs(self._local_gomod_cache, exist_ok=True)
-            volumes[self._local_go_cache] = {"bind": "/go/pkg", "mode": "rw"}
-            volumes[self._local_gomod_cache] = {"bind": "/root/.cache/go-build", "mode": "rw"}
+            volumes[self._local_go_cache] = {"bind": "/go/pkg", "mode": self._CACHE_MOUNT_MODE}
+            volumes[self._local_gomod_cache] = {"bind": "/root/.cache/go-build", "mode": self._CACHE_MOUNT_MODE}
         
         return volumes
     
@@ -276,10 +692,10 @@ class GoLangDockerRepo(AbstractDockerRepo):
         
         try:
             self.evaluation_time = time.time()
-            self.timeout_exec_run(f"sh -c '{command}'", timeout=timeout)
+            self.timeout_exec_run(_exec_argv(command), timeout=timeout)
         except TimeOutException:
             self.return_code = 2
-            self.stderr = b"Timeout exception"
+            self.stderr = _TIMEOUT_STDERR
             raise TimeOutException(f"Command timed out after {timeout}s.")
         finally:
             self.evaluation_time = time.time() - self.evaluation_time
@@ -293,40 +709,21 @@ class GoLangDockerRepo(AbstractDockerRepo):
             self.stop_container()
         return self._format_results()
     
-    def _commit_container_image(self, retries: int = 3, delay: int = 10) -> None:
-        for attempt in range(retries):
-            try:
-                self.container.commit(self.default_image_name)
-                self.image_name = self.default_image_name
-                return
-            except APIError:
-                if attempt == retries - 1:
-                    raise
-                time.sleep(delay)
-    
-    def _image_exists(self, name: str) -> bool:
-        try:
-            self.docker_client.images.get(name)
-            return True
-        except (ImageNotFound, APIError):
-            return False
-    
-    @property
-    def was_build(self) -> bool:
-        return self._image_exists(self.default_image_name)
-    
     def __call__(self, command_build: str = "go build ./...", command_test: str = "go test -json ./...", timeout_build: int = DEFAULT_BUILD_TIMEOUT_INT,
-                 timeout_test: int = DEFAULT_EVAL_TIMEOUT_INT) -> Dict[str, object]:
-        if not self.was_build:
-            self.build_env(command=command_build, timeout=timeout_build)
-        return self.run_test(command=command_test, timeout=timeout_test)
+                 timeout_test: int = DEFAULT_EVAL_TIMEOUT_INT, keep_alive: bool = False) -> Dict[str, object]:
+        return super().__call__(command_build=command_build, command_test=command_test, timeout_build=timeout_build,
+                                timeout_test=timeout_test, keep_alive=keep_alive)
     
     def run_test(self, command: str = "go test -json ./...", timeout: int = DEFAULT_EVAL_TIMEOUT_INT,
-                 stop_container: bool = True) -> Dict[str, object]:
+                 stop_container: bool = True, summary_only: bool = False,
+                 reuse_container: bool = False) -> Dict[str, object]:
         
-        volumes = self._setup_container_volumes(workdir="/run_dir")
-        self.start_container(image_name=self.image_name, container_name=self.container_name,
-                           volumes=volumes, working_dir="/run_dir")
+        if reuse_container and self._container_running():
+            logger.info("Running tests in the already running container %s", self.container.name)
+        else:
+            volumes = self._setup_container_volumes(workdir="/run_dir")
+            self.start_container(image_name=self.image_name, container_name=self.container_name,
+                               volumes=volumes, working_dir="/run_dir")
         
         try:
             self.evaluation_time = time.time()
@@ -335,37 +732,56 @@ class GoLangDockerRepo(AbstractDockerRepo):
             if "go test" in command and "-json" not in command:
                 modified_command = command.replace("go test", "go test -json")
             
-            full_command = f"mkdir -p /run_dir/test-results && if which go-junit-report >/dev/null 2>&1; then {modified_command} | tee /run_dir/test-results/go-test.json | go-junit-report > /run_dir/test-results/junit.xml; else {modified_command} > /run_dir/test-results/go-test.json; fi"
+            full_command = f"mkdir -p /run_dir/test-results && {modified_command} > /run_dir/test-results/go-test.json"
+            if self.enable_junit_fallback:
+                # go-junit-report only runs when the event stream holds no test event
+                # at all; otherwise junit.xml would never be read (see below)
+                full_command += (
+                    "; status=$?; if which go-junit-report >/dev/null 2>&1"
+                    " && ! grep -q '\"Test\":' /run_dir/test-results/go-test.json; then"
+                    " go-junit-report < /run_dir/test-results/go-test.json > /run_dir/test-results/junit.xml;"
+                    " fi; exit $status"
+                )
             
-            self.timeout_exec_run(
-                f"sh -c '{full_command}'",
-                timeout=timeout
-            )
+            # The pipeline needs a shell; the argv form hands it over unquoted
+            self.timeout_exec_run(["sh", "-c", full_command], timeout=timeout)
         except TimeOutException:
             self.return_code = 2
-            self.stderr = b"Timeout exception"
+            self.stderr = _TIMEOUT_STDERR
         finally:
             self.evaluation_time = time.time() - self.evaluation_time
             self._convert_std_from_bytes_to_str()
         
+        # One scandir pass: entry types come with the listing, and empty files
+        # (a run that died before writing) are dropped without being opened
         all_report_files = set()
         report_dir = os.path.join(self.cache_folder, "test-results")
-        if os.path.exists(report_dir) and os.path.isdir(report_dir):
-            for filename in os.listdir(report_dir):
-                if filename.endswith((".json", ".xml")):
-                    all_report_files.add(os.path.join(report_dir, filename))
+        try:
+            with os.scandir(report_dir) as entries:
+                for entry in entries:
+                    if (entry.name.endswith((".json", ".xml")) and entry.is_file()
+                            and entry.stat().st_size > 0):
+                        all_report_files.add(entry.path)
+        except (FileNotFoundError, NotADirectoryError):
+            pass
         
-        known_paths = [
+        known_paths = (
             os.path.join(self.cache_folder, "gotest_results.jsonl"),
-        ]
+        )
         
         for report_path in known_paths:
-            if os.path.exists(report_path):
+            try:
+                st = os.stat(report_path)
+            except FileNotFoundError:
+                continue
+            if stat.S_ISREG(st.st_mode) and st.st_size > 0:
                 all_report_files.add(report_path)
 
         parsed_reports = []
-        for report_file in all_report_files:
-            parsed_report = parse_go_test_report(report_file)
+
+        def _add_report(report_file: str) -> bool:
+            parsed_report = parse_go_test_report(report_file, summary_only=summary_only,
+                                                 state=self._parser_state)
             if isinstance(parsed_report, dict):
                 summary = parsed_report.get("summary", {})
                 if isinstance(summary, dict):
@@ -374,6 +790,19 @@ class GoLangDockerRepo(AbstractDockerRepo):
                     total = 0
                 if total > 0:
                     parsed_reports.append(parsed_report)
+                    return True
+            return False
+
+        # junit.xml is produced by go-junit-report from the same event stream as
+        # go-test.json, so it is only parsed when the event stream gave nothing.
+        go_test_json = os.path.join(report_dir, _GO_TEST_JSON_NAME)
+        if go_test_json in all_report_files:
+            all_report_files.discard(go_test_json)
+            if _add_report(go_test_json):
+                all_report_files.discard(os.path.join(report_dir, _GO_JUNIT_XML_NAME))
+
+        for report_file in all_report_files:
+            _add_report(report_file)
 
         test_results = self._merge_reports(parsed_reports)
         
@@ -383,13 +812,16 @@ class GoLangDockerRepo(AbstractDockerRepo):
         return self._format_results(test_json=test_results)
     
     def _format_results(self, test_json: Optional[Dict] = None) -> Dict[str, object]:
-        default_result = {
-            "tests": [],
-            "summary": {"total": 0, "passed": 0, "failed": 0, "skipped": 0, "errors": 0, "collected": 0},
-            "status": "unknown",
-            "packages": {}
-        }
-        parser_result = test_json or default_result
+        # test_json is the parse run_test already did; nothing is re-parsed here
+        if test_json:
+            parser_result = test_json
+        else:
+            parser_result = {
+                "tests": [],
+                "summary": {"total": 0, "passed": 0, "failed": 0, "skipped": 0, "errors": 0, "collected": 0},
+                "status": "unknown",
+                "packages": {}
+            }
         
         return {
             "stdout": self.stdout,
@@ -4,19 +4,26 @@ import os
 import time
 from enum import Enum, auto
 from functools import cached_property
-from typing import Dict, Literal, Optional
+from typing import Dict, Literal, Optional, Tuple
 
-from docker.errors import APIError, ImageNotFound
 from repotest.constants import (DEFAULT_BUILD_TIMEOUT_INT,
                                 DEFAULT_CACHE_FOLDER, DEFAULT_EVAL_TIMEOUT_INT,
                                 DOCKER_PYTHON_DEFAULT_IMAGE)
 from repotest.core.docker.base import AbstractDockerRepo
 from repotest.core.exceptions import TimeOutException
+from repotest.parsers.python.javascript_report import load_json_report
 from repotest.parsers.python.javascript_stout import parse_test_stdout
 from repotest.core.docker.types import CacheMode
 import xmltodict
 
 logger = logging.getLogger("repotest")
+
+
+def _non_empty_file(path: str) -> bool:
+    try:
+        return os.stat(path).st_size > 0
+    except OSError:
+        return False
     
 
 class JavaScriptDockerRepo(AbstractDockerRepo):
@@ -53,24 +60,24 @@ class JavaScriptDockerRepo(AbstractDockerRepo):
     def _local_javascript_cache(self) -> str:
         return os.path.join(self.cache_folder, ".javascript_cache")
     
-    def _setup_container_volumes(self, workdir: Optional[str] = None) -> Dict[str, Dict[str, str]]:
-        volumes = {}
-        if workdir:
-            volumes[self.cache_folder] = {"bind": workdir, "mode": "rw"}
+    @property
+    def _local_cache_dirs(self) -> Tuple[str, ...]:
+        return (self._local_npm_cache, self._local_javascript_cache)
+
+    def _container_volumes(self, workdir: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+        volumes = super()._container_volumes(workdir)
         
         if self.cache_mode == "volume":
             self.create_volume("npm-cache")
             self.create_volume("javascript-cache")
-            volumes["npm-cache"] = {"bind": "/root/.npm", "mode": "rw"}
-            volumes["javascript-cache"] = {"bind": "/root/.cache/javascript", "mode": "rw"}
+            volumes["npm-cache"] = {"bind": "/root/.npm", "mode": self._CACHE_MOUNT_MODE}
+            volumes["javascript-cache"] = {"bind": "/root/.cache/javascript", "mode": self._CACHE_MOUNT_MODE}
         elif self.cache_mode == "shared":
             if os.path.exists(self._user_npm_cache):
-                volumes[self._user_npm_cache] = {"bind": "/root/.npm", "mode": "rw"}
+                volumes[self._user_npm_cache] = {"bind": "/root/.npm", "mode": self._CACHE_MOUNT_MODE}
         elif self.cache_mode == "local":
-            os.makedirs(self._local_npm_cache, exist_ok=True)
-            os.makedirs(self._local_javascript_cache, exist_ok=True)
-            volumes[self._local_npm_cache] = {"bind": "/root/.npm", "mode": "rw"}
-            volumes[self._local_javascript_cache] = {"bind": "/root/.cache/javascript", "mode": "rw"}
+            volumes[self._local_npm_cache] = {"bind": "/root/.npm", "mode": self._CACHE_MOUNT_MODE}
+            volumes[self._local_javascript_cache] = {"bind": "/root/.cache/javascript", "mode": self._CACHE_MOUNT_MODE}
         
         return volumes
 
@@ -104,7 +111,7 @@ class JavaScriptDockerRepo(AbstractDockerRepo):
         command = "ulimit -n 65535;\n" + command
         try:
             self.evaluation_time = time.time()
-            self.timeout_exec_run(f"bash -c '{command}'", timeout=timeout)
+            self.timeout_exec_run(["bash", "-c", command], timeout=timeout)
         except TimeOutException:
             logger.error("Timeout exception during build_env")
             self.return_code = 2
@@ -128,22 +135,6 @@ class JavaScriptDockerRepo(AbstractDockerRepo):
 
         return self._format_results()
 
-    def _image_exists(self, name: str) -> bool:
-        """Check if a Docker image exists."""
-        try:
-            self.docker_client.images.get(name)
-            return True
-        except ImageNotFound:
-            return False
-        except APIError as e:
-            logger.warning(f"Docker API error when checking image: {e}")
-            return False
-
-    @property
-    def was_build(self) -> bool:
-        """Check if the image was already built."""
-        return self._image_exists(self.default_image_name)
-
     def _mock_path(self, command: str) -> str:
         """Ensure PATH and PYTHONPATH are set correctly."""
         prefix = """ulimit -n 65535;"""
@@ -154,12 +145,15 @@ class JavaScriptDockerRepo(AbstractDockerRepo):
     
     def read_mocha_xml(self):
         fn_mocha = os.path.join(self.cache_folder, 'test-results.xml')
-        if not os.path.exists(fn_mocha):
-            logger.critical("file %s not exist (full: %s)", "test-results.xml", fn)
+        try:
+            with open(fn_mocha, "rb") as f:
+                # Streamed from the file by expat, without reading it into memory first
+                dct = xmltodict.parse(f)
+        except FileNotFoundError:
+            logger.critical("file %s not exist (full: %s)", "test-results.xml", fn_mocha)
             return {}
-        
-        dct = xmltodict.parse(open(fn_mocha, "r").read())
-        assert 'summary' not in dct
+        if 'summary' in dct:
+            raise ValueError(f"{fn_mocha} already has a 'summary' key")
 
         n_total = int(dct['testsuites']['@tests'])
         n_failed = int(dct['testsuites']['@failures'])
@@ -176,12 +170,13 @@ class JavaScriptDockerRepo(AbstractDockerRepo):
     
     def read_jest_json(self):
         fn_jest = os.path.join(self.cache_folder, 'jest-results.json')
-        if not os.path.exists(fn_jest):
-            logger.critical("file %s not exist (full: %s)", "test-results.xml", fn)
+        try:
+            dct = load_json_report(fn_jest)
+        except FileNotFoundError:
+            logger.critical("file %s not exist (full: %s)", "jest-results.json", fn_jest)
             return {}
-
-        dct = json.load(open(fn_jest, "r"))
-        assert 'summary' not in dct
+        if 'summary' in dct:
+            raise ValueError(f"{fn_jest} already has a 'summary' key")
 
         n_total = dct['numTotalTests']
         n_passed = dct['numPassedTests']
@@ -200,8 +195,9 @@ class JavaScriptDockerRepo(AbstractDockerRepo):
         fn_mocha = os.path.join(self.cache_folder, 'test-results.xml')
         fn_jest  = os.path.join(self.cache_folder, 'jest-results.json')
 
-        test_exist_mocha = os.path.exists(fn_mocha)
-        test_exist_jest = os.path.exists(fn_jest)
+        # One stat per report; an empty file (reporter killed before writing) counts as missing
+        test_exist_mocha = _non_empty_file(fn_mocha)
+        test_exist_jest = _non_empty_file(fn_jest)
 
         if test_exist_mocha & test_exist_jest:
             logger.critical("Found mocha and jest mocha=%s, jest=%s", fn_mocha, fn_jest)
@@ -240,7 +236,7 @@ class JavaScriptDockerRepo(AbstractDockerRepo):
 
         try:
             self.evaluation_time = time.time()
-            self.timeout_exec_run(f"bash -c '{command}'", timeout=timeout)
+            self.timeout_exec_run(["bash", "-c", command], timeout=timeout)
         except TimeOutException:
             logger.error("Timeout exception during test execution")
             self.return_code = 2
@@ -1,95 +1,168 @@
 import json, logging, os, time
+from concurrent.futures.process import BrokenProcessPool
 from functools import cached_property
-from typing import Dict, Literal, Optional
-from docker.errors import APIError, ImageNotFound
+from itertools import chain
+from typing import BinaryIO, Dict, List, Literal, Optional, Tuple
 from repotest.constants import DEFAULT_BUILD_TIMEOUT_INT, DEFAULT_CACHE_FOLDER, DEFAULT_EVAL_TIMEOUT_INT
 from repotest.core.docker.base import AbstractDockerRepo
+from repotest.core.docker.report_files import (first_non_space_byte, parse_pool, parse_workers,
+                                               scan_report_files)
 from repotest.core.exceptions import TimeOutException
 from repotest.core.docker.types import CacheMode
+import xml.etree.ElementTree as ET
 
 logger = logging.getLogger("repotest")
 
-def parse_kotlin_test_report(report_path: str) -> Dict[str, object]:
-    if not os.path.exists(report_path):
-        return {}
+_REPORT_EXTS = frozenset(("json", "xml"))
+# Relative to the repo root; Gradle writes JUnit XML to the first one
+_REPORT_DIRS = ("build/test-results/test", "test-results")
+# Below this many report bytes a process pool costs more to start than it saves
+# (serial parsing runs at ~17 MB/s, a pool worker takes ~0.7s to start)
+_PARALLEL_PARSE_THRESHOLD = 16 * 1024 * 1024
+
+# Unchanged compile tasks are restored from ~/.gradle/caches/build-cache-1, which the
+# gradle-cache volume keeps across runs. The init script (written inside the container,
+# the repo is not touched) keeps every Test task out of the cache, so tests always run.
+_GRADLE_NO_TEST_CACHE_INIT = "/tmp/repotest-no-test-cache.gradle"
+_GRADLE_TEST_COMMAND = (
+    'echo "allprojects { tasks.withType(Test).configureEach { outputs.cacheIf { false } } }"'
+    f" > {_GRADLE_NO_TEST_CACHE_INIT}"
+    f" && ./gradlew test --build-cache --init-script {_GRADLE_NO_TEST_CACHE_INIT}"
+)
+
+
+def _parse_kotlin_testcase(testcase) -> Dict[str, object]:
+    test_info = {
+        "name": testcase.get("name"),
+        "classname": testcase.get("classname"),
+        "time": float(testcase.get("time", 0)),
+        "status": "passed"
+    }
+    
+    failure = testcase.find("failure")
+    error = testcase.find("error")
+    skipped = testcase.find("skipped")
     
+    if failure is not None:
+        test_info["status"] = "failed"
+        test_info["message"] = failure.get("message", "")
+        test_info["details"] = failure.text or ""
+    elif error is not None:
+        test_info["status"] = "error"
+        test_info["message"] = error.get("message", "")
+        test_info["details"] = error.text or ""
+    elif skipped is not None:
+        test_info["status"] = "skipped"
+        test_info["message"] = skipped.get("message", "")
+    return test_info
+
+
+def _parse_kotlin_junit_xml(f: BinaryIO) -> Dict[str, object]:
+    """
+    Stream a JUnit XML report with iterparse, freeing each testcase once read.
+
+    Same selection as a DOM walk over ``root.findall(".//testsuite")`` and their
+    direct ``<testcase>`` children; a root ``<testsuite>`` counts only when it
+    has no nested suites.
+    """
+    summary = {"total": 0, "passed": 0, "failed": 0, "skipped": 0, "errors": 0}
+    suite_tests = []   # one list per nested <testsuite>, in document order
+    root = None
+    root_tests = []    # direct testcases of a root <testsuite>
+    # For every open element: the list its <testcase> children go to, or None
+    buckets = []
+    
+    for event, elem in ET.iterparse(f, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+                buckets.append(root_tests if elem.tag == "testsuite" else None)
+            elif elem.tag == "testsuite":
+                get = elem.get
+                summary["total"] += int(get("tests", 0))
+                summary["failed"] += int(get("failures", 0))
+                summary["errors"] += int(get("errors", 0))
+                summary["skipped"] += int(get("skipped", 0))
+                tests = []
+                suite_tests.append(tests)
+                buckets.append(tests)
+            else:
+                buckets.append(None)
+            continue
+        
+        buckets.pop()
+        if elem.tag == "testcase":
+            bucket = buckets[-1] if buckets else None
+            if bucket is not None:
+                bucket.append(_parse_kotlin_testcase(elem))
+        elif elem.tag != "testsuite" or elem is root:
+            continue
+        # Nothing below a finished testcase/testsuite is read again
+        elem.clear()
+    
+    if not suite_tests and root.tag == "testsuite":
+        get = root.get
+        summary["total"] += int(get("tests", 0))
+        summary["failed"] += int(get("failures", 0))
+        summary["errors"] += int(get("errors", 0))
+        summary["skipped"] += int(get("skipped", 0))
+        suite_tests.append(root_tests)
+    
+    summary["passed"] = summary["total"] - summary["failed"] - summary["errors"] - summary["skipped"]
+    return {
+        "tests": [test for tests in suite_tests for test in tests],
+        "summary": summary,
+        "status": "passed" if (summary["failed"] + summary["errors"]) == 0 else "failed",
+    }
+
+
+def parse_kotlin_test_report(report_path: str) -> Dict[str, object]:
     try:
-        with open(report_path, "r") as f:
-            content = f.read()
+        with open(report_path, "rb") as f:
+            first = first_non_space_byte(f)
+            if not first:
+                return {}
             
-            if content.strip().startswith("{") or content.strip().startswith("["):
-                data = json.loads(content)
+            if first in (b"{", b"["):
+                data = json.loads(f.read())
                 
                 if "tests" in data and "summary" in data:
                     return data
                 
                 return {}
             
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(content)
-            
-            result = {
-                "tests": [],
-                "summary": {
-                    "total": 0,
-                    "passed": 0,
-                    "failed": 0,
-                    "skipped": 0,
-                    "errors": 0
-                }
-            }
-            
-            testsuites = root.findall(".//testsuite")
-            if not testsuites and root.tag == "testsuite":
-                testsuites = [root]
-            
-            for testsuite in testsuites:
-                result["summary"]["total"] += int(testsuite.get("tests", 0))
-                result["summary"]["failed"] += int(testsuite.get("failures", 0))
-                result["summary"]["errors"] += int(testsuite.get("errors", 0))
-                result["summary"]["skipped"] += int(testsuite.get("skipped", 0))
-                
-                for testcase in testsuite.findall("testcase"):
-                    test_info = {
-                        "name": testcase.get("name"),
-                        "classname": testcase.get("classname"),
-                        "time": float(testcase.get("time", 0)),
-                        "status": "passed"
-                    }
-                    
-                    failure = testcase.find("failure")
-                    error = testcase.find("error")
-                    skipped = testcase.find("skipped")
-                    
-                    if failure is not None:
-                        test_info["status"] = "failed"
-                        test_info["message"] = failure.get("message", "")
-                        test_info["details"] = failure.text or ""
-                    elif error is not None:
-                        test_info["status"] = "error"
-                        test_info["message"] = error.get("message", "")
-                        test_info["details"] = error.text or ""
-                    elif skipped is not None:
-                        test_info["status"] = "skipped"
-                        test_info["message"] = skipped.get("message", "")
-                    
-                    result["tests"].append(test_info)
-            
-            result["summary"]["passed"] = (
-                result["summary"]["total"] 
-                - result["summary"]["failed"] 
-                - result["summary"]["errors"] 
-                - result["summary"]["skipped"]
-            )
-            result["status"] = "passed" if (result["summary"]["failed"] + result["summary"]["errors"]) == 0 else "failed"
-            
-            return result
-            
+            return _parse_kotlin_junit_xml(f)
+    
+    except FileNotFoundError:
+        return {}
     except (json.JSONDecodeError, Exception) as e:
         logger.warning(f"Failed to parse test report: {e}")
         return {}
 
 
+def _parse_report_files(report_files: List[str]) -> List[Dict[str, object]]:
+    """
+    ``parse_kotlin_test_report`` for every file, in order.
+
+    Gradle writes one XML file per test class; when there are megabytes of them
+    they are parsed in a process pool.
+    """
+    workers = min(len(report_files), parse_workers())
+    if workers > 1:
+        try:
+            total_size = sum(os.stat(path).st_size for path in report_files)
+        except OSError:
+            total_size = 0
+        if total_size >= _PARALLEL_PARSE_THRESHOLD:
+            try:
+                with parse_pool(workers) as pool:
+                    return list(pool.map(parse_kotlin_test_report, report_files, chunksize=8))
+            except (OSError, BrokenProcessPool) as e:
+                # No worker processes available (e.g. fork refused); parse in this process
+                logger.warning(f"Parallel report parsing failed, parsing serially: {e}")
+    return [parse_kotlin_test_report(path) for path in report_files]
+
+
 class KotlinDockerRepo(AbstractDockerRepo):
     
     def __init__(self,
@@ -119,10 +192,12 @@ class KotlinDockerRepo(AbstractDockerRepo):
     def _local_kotlin_cache(self) -> str:
         return os.path.join(self.cache_folder, ".kotlin_cache")
     
-    def _setup_container_volumes(self, workdir: Optional[str] = None) -> Dict[str, Dict[str, str]]:
-        volumes = {}
-        if workdir:
-            volumes[self.cache_folder] = {"bind": workdir, "mode": "rw"}
+    @property
+    def _local_cache_dirs(self) -> Tuple[str, ...]:
+        return (self._local_gradle_cache, self._local_kotlin_cache)
+    
+    def _container_volumes(self, workdir: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+        volumes = super()._container_volumes(workdir)
         
         if self.cache_mode == "volume":
             self.create_volume("gradle-cache")
@@ -131,12 +206,10 @@ class KotlinDockerRepo(AbstractDockerRepo):
             volumes["kotlin-cache"] = {"bind": "/root/.kotlin", "mode": "rw"}
         elif self.cache_mode == "shared":
             if os.path.exists(self._user_gradle_cache):
-                volumes[self._user_gradle_cache] = {"bind": "/root/.gradle", "mode": "rw"}
+                volumes[self._user_gradle_cache] = {"bind": "/root/.gradle", "mode": self._CACHE_MOUNT_MODE}
         elif self.cache_mode == "local":
-            os.makedirs(self._local_gradle_cache, exist_ok=True)
-            os.makedirs(self._local_kotlin_cache, exist_ok=True)
-            volumes[self._local_gradle_cache] = {"bind": "/root/.gradle", "mode": "rw"}
-            volumes[self._local_kotlin_cache] = {"bind": "/root/.kotlin", "mode": "rw"}
+            volumes[self._local_gradle_cache] = {"bind": "/root/.gradle", "mode": self._CACHE_MOUNT_MODE}
+            volumes[self._local_kotlin_cache] = {"bind": "/root/.kotlin", "mode": self._CACHE_MOUNT_MODE}
         
         return volumes
     
@@ -144,26 +217,22 @@ class KotlinDockerRepo(AbstractDockerRepo):
         if not reports:
             return {}
         
-        merged_result = {
-            "tests": [],
-            "summary": {"total": 0, "passed": 0, "failed": 0, "skipped": 0, "errors": 0}
-        }
-        
+        total = passed = failed = skipped = errors = 0
         for report in reports:
-            if "tests" in report:
-                merged_result["tests"].extend(report.get("tests", []))
-            
             summary = report.get("summary", {})
             if isinstance(summary, dict):
-                merged_result["summary"]["total"] += summary.get("total", 0)
-                merged_result["summary"]["passed"] += summary.get("passed", 0)
-                merged_result["summary"]["failed"] += summary.get("failed", 0)
-                merged_result["summary"]["skipped"] += summary.get("skipped", 0)
-                merged_result["summary"]["errors"] += summary.get("errors", 0)
+                get = summary.get
+                total += get("total", 0)
+                passed += get("passed", 0)
+                failed += get("failed", 0)
+                skipped += get("skipped", 0)
+                errors += get("errors", 0)
         
-        merged_result["status"] = "passed" if (merged_result["summary"]["failed"] + merged_result["summary"]["errors"]) == 0 and merged_result["summary"]["total"] > 0 else "failed"
-        
-        return merged_result
+        return {
+            "tests": list(chain.from_iterable(report.get("tests", ()) for report in reports)),
+            "summary": {"total": total, "passed": passed, "failed": failed, "skipped": skipped, "errors": errors},
+            "status": "passed" if (failed + errors) == 0 and total > 0 else "failed",
+        }
     
     def build_env(self, command: str, timeout: int = DEFAULT_BUILD_TIMEOUT_INT, commit_image: bool = True,
                   stop_container: bool = True, push_image: bool = False) -> Dict[str, object]:
@@ -172,31 +241,6 @@ class KotlinDockerRepo(AbstractDockerRepo):
         self.start_container(image_name=self.image_name, container_name=self.container_name,
                            volumes=volumes, working_dir="/run_dir")
         
-        try:
-            result = self.timeout_exec_run(
-                "bash -c 'cat /run_dir/build.gradle.kts 2>/dev/null || cat /run_dir/build.gradle 2>/dev/null || echo \"\"'",
-                timeout=30
-            ) or {}
-            
-            build_gradle_content = result.get("stdout", b"").decode("utf-8", errors="ignore")
-            
-            if "build.gradle" in build_gradle_content or len(build_gradle_content) > 0:
-                gradle_config = '''
-                                tasks.test {
-                                    useJUnitPlatform()
-                                    reports {
-                                        junitXml.required.set(true)
-                                        junitXml.outputLocation.set(file("test-results/junit.xml"))
-                                    }
-                                }
-                                '''
-                self.timeout_exec_run(
-                    f"bash -c 'echo \"{gradle_config}\" >> /run_dir/build.gradle.kts || echo \"{gradle_config}\" >> /run_dir/build.gradle'",
-                    timeout=30
-                )
-        except Exception as e:
-            logger.warning(f"Failed to configure test reporters: {e}")
-        
         try:
             self.evaluation_time = time.time()
             self.timeout_exec_run(f"bash -c 'mkdir -p /run_dir/test-results && {command}'", timeout=timeout)
@@ -218,40 +262,15 @@ class KotlinDockerRepo(AbstractDockerRepo):
             self.stop_container()
         return self._format_results()
     
-    def _commit_container_image(self, retries: int = 3, delay: int = 10) -> None:
-        for attempt in range(retries):
-            try:
-                self.container.commit(self.default_image_name)
-                self.image_name = self.default_image_name
-                return
-            except APIError:
-                if attempt == retries - 1:
-                    raise
-                time.sleep(delay)
-    
-    def _image_exists(self, name: str) -> bool:
-        try:
-            self.docker_client.images.get(name)
-            return True
-        except (ImageNotFound, APIError):
-            return False
-    
-    @property
-    def was_build(self) -> bool:
-        return self._image_exists(self.default_image_name)
-    
-    def __call__(self, command_build: str, command_test: str, timeout_build: int = DEFAULT_BUILD_TIMEOUT_INT,
-                 timeout_test: int = DEFAULT_EVAL_TIMEOUT_INT) -> Dict[str, object]:
-        if not self.was_build:
-            self.build_env(command=command_build, timeout=timeout_build)
-        return self.run_test(command=command_test, timeout=timeout_test)
-    
-    def run_test(self, command: str = "./gradlew test", timeout: int = DEFAULT_EVAL_TIMEOUT_INT,
-                 stop_container: bool = True) -> Dict[str, object]:
+    def run_test(self, command: str = _GRADLE_TEST_COMMAND, timeout: int = DEFAULT_EVAL_TIMEOUT_INT,
+                 stop_container: bool = True, reuse_container: bool = False) -> Dict[str, object]:
         
-        volumes = self._setup_container_volumes(workdir="/run_dir")
-        self.start_container(image_name=self.image_name, container_name=self.container_name,
-                           volumes=volumes, working_dir="/run_dir")
+        if reuse_container and self._container_running():
+            logger.info("Running tests in the already running container %s", self.container.name)
+        else:
+            volumes = self._setup_container_volumes(workdir="/run_dir")
+            self.start_container(image_name=self.image_name, container_name=self.container_name,
+                               volumes=volumes, working_dir="/run_dir")
         
         try:
             self.evaluation_time = time.time()
@@ -265,31 +284,14 @@ class KotlinDockerRepo(AbstractDockerRepo):
             self.evaluation_time = time.time() - self.evaluation_time
             self._convert_std_from_bytes_to_str()
         
-        all_report_files = set()
         cache_folder = self.cache_folder if self.cache_folder is not None else "."
-
-        report_dirs = [
-            os.path.join(cache_folder, "build/test-results/test"),
-            os.path.join(cache_folder, "test-results")
-        ]
-        
-        for report_dir in report_dirs:
-            if os.path.exists(report_dir) and os.path.isdir(report_dir):
-                for filename in os.listdir(report_dir):
-                    if filename.endswith((".json", ".xml")):
-                        all_report_files.add(os.path.join(report_dir, filename))
-
-        known_paths = [
-            os.path.join(cache_folder, "build/test-results/test/TEST-junit-jupiter.xml"),
-        ]
-        
-        for report_path in known_paths:
-            if os.path.exists(report_path) and os.path.isfile(report_path):
-                    all_report_files.add(report_path)
+        # build/test-results/test also holds TEST-junit-jupiter.xml
+        all_report_files = []
+        for report_dir in _REPORT_DIRS:
+            all_report_files.extend(scan_report_files(os.path.join(cache_folder, report_dir), _REPORT_EXTS))
         
         parsed_reports = []
-        for report_file in all_report_files:
-            parsed_report = parse_kotlin_test_report(report_file)
+        for parsed_report in _parse_report_files(all_report_files):
             if parsed_report and parsed_report.get("summary", {}).get("total", 0) > 0:
                 parsed_reports.append(parsed_report)
         
@@ -0,0 +1,62 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Collection, List
+
+_SNIFF_CHUNK_SIZE = 4096
+_MAX_PARSE_WORKERS = 8
+# Parse workers are not forked from this process: run_test may still have timeout_exec_run
+# threads alive, and forking a multi-threaded process can deadlock the child
+_PARSE_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def scan_report_files(report_dir: str, extensions: Collection[str]) -> List[str]:
+    """Return paths of the files directly in ``report_dir`` whose extension is in ``extensions``."""
+    found = []
+    try:
+        entries = os.scandir(report_dir)
+    except (FileNotFoundError, NotADirectoryError):
+        return found
+    with entries:
+        for entry in entries:
+            name = entry.name
+            dot = name.rfind(".")
+            if dot > 0 and name[dot + 1:] in extensions:
+                found.append(entry.path)
+    return found
+
+
+def first_non_space_byte(f: BinaryIO) -> bytes:
+    """
+    Return the first non-whitespace byte of ``f`` and rewind it.
+
+    The peeked chunk stays in ``f``'s read buffer, so the parser that follows
+    does not read it from disk again.
+    """
+    first = b""
+    while True:
+        chunk = f.read(_SNIFF_CHUNK_SIZE)
+        if not chunk:
+            break
+        stripped = chunk.lstrip()
+        if stripped:
+            first = stripped[:1]
+            break
+    f.seek(0)
+    return first
+
+
+def parse_workers() -> int:
+    """Number of worker processes for parsing test reports."""
+    return min(os.cpu_count() or 1, _MAX_PARSE_WORKERS)
+
+
+def parse_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool for parsing test reports, started with forkserver (spawn where unavailable).
+
+    A worker takes about 0.5s to start, so callers only use it for tens of megabytes of reports.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=_PARSE_MP_CONTEXT)
@@ -3,12 +3,12 @@ import logging
 import os
 import time
 from functools import cached_property
-from typing import Dict, Optional
-from docker.errors import APIError, ImageNotFound
+from typing import Dict, Optional, Tuple
 from repotest.constants import (DEFAULT_BUILD_TIMEOUT_INT,
                                 DEFAULT_CACHE_FOLDER, DEFAULT_EVAL_TIMEOUT_INT)
 from repotest.core.docker.base import AbstractDockerRepo
 from repotest.core.exceptions import TimeOutException
+from repotest.parsers.python.javascript_report import load_json_report
 from repotest.parsers.python.javascript_stout import parse_test_stdout
 from repotest.core.docker.types import CacheMode
 import xmltodict
@@ -49,24 +49,24 @@ class TypeScriptDockerRepo(AbstractDockerRepo):
     def _local_typescript_cache(self) -> str:
         return os.path.join(self.cache_folder, ".typescript_cache")
     
-    def _setup_container_volumes(self, workdir: Optional[str] = None) -> Dict[str, Dict[str, str]]:
-        volumes = {}
-        if workdir:
-            volumes[self.cache_folder] = {"bind": workdir, "mode": "rw"}
+    @property
+    def _local_cache_dirs(self) -> Tuple[str, ...]:
+        return (self._local_npm_cache, self._local_typescript_cache)
+
+    def _container_volumes(self, workdir: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+        volumes = super()._container_volumes(workdir)
         
         if self.cache_mode == "volume":
             self.create_volume("npm-cache")
             self.create_volume("typescript-cache")
-            volumes["npm-cache"] = {"bind": "/root/.npm", "mode": "rw"}
-            volumes["typescript-cache"] = {"bind": "/root/.cache/typescript", "mode": "rw"}
+            volumes["npm-cache"] = {"bind": "/root/.npm", "mode": self._CACHE_MOUNT_MODE}
+            volumes["typescript-cache"] = {"bind": "/root/.cache/typescript", "mode": self._CACHE_MOUNT_MODE}
         elif self.cache_mode == "shared":
             if os.path.exists(self._user_npm_cache):
-                volumes[self._user_npm_cache] = {"bind": "/root/.npm", "mode": "rw"}
+                volumes[self._user_npm_cache] = {"bind": "/root/.npm", "mode": self._CACHE_MOUNT_MODE}
         elif self.cache_mode == "local":
-            os.makedirs(self._local_npm_cache, exist_ok=True)
-            os.makedirs(self._local_typescript_cache, exist_ok=True)
-            volumes[self._local_npm_cache] = {"bind": "/root/.npm", "mode": "rw"}
-            volumes[self._local_typescript_cache] = {"bind": "/root/.cache/typescript", "mode": "rw"}
+            volumes[self._local_npm_cache] = {"bind": "/root/.npm", "mode": self._CACHE_MOUNT_MODE}
+            volumes[self._local_typescript_cache] = {"bind": "/root/.cache/typescript", "mode": self._CACHE_MOUNT_MODE}
         
         return volumes
 
@@ -99,7 +99,7 @@ class TypeScriptDockerRepo(AbstractDockerRepo):
         command = "ulimit -n 65535;\n" + command
         try:
             self.evaluation_time = time.time()
-            self.timeout_exec_run(f"bash -c '{command}'", timeout=timeout)
+            self.timeout_exec_run(["bash", "-c", command], timeout=timeout)
         except TimeOutException:
             logger.error("Timeout exception during build_env")
             self.return_code = 2
@@ -133,31 +133,6 @@ class TypeScriptDockerRepo(AbstractDockerRepo):
 
         return self._format_results()
 
-    def _image_exists(self, name: str) -> bool:
-        try:
-            self.docker_client.images.get(name)
-            return True
-        except ImageNotFound:
-            return False
-        except APIError as e:
-            logger.warning(f"Docker API error when checking image: {e}")
-            return False
-    
-    def _commit_container_image(self, retries: int = 3, delay: int = 10) -> None:
-        for attempt in range(retries):
-            try:
-                self.container.commit(self.default_image_name)
-                self.image_name = self.default_image_name
-                return
-            except APIError:
-                if attempt == retries - 1:
-                    raise
-                time.sleep(delay)
-
-    @property
-    def was_build(self) -> bool:
-        return self._image_exists(self.default_image_name)
-
     def _mock_path(self, command: str) -> str:
         prefix = """ulimit -n 65535;"""
         return command if command.startswith(prefix) else prefix + command
@@ -178,8 +153,11 @@ class TypeScriptDockerRepo(AbstractDockerRepo):
             return {}
         
         try:
-            dct = xmltodict.parse(open(fn_mocha, "r").read())
-            assert 'summary' not in dct
+            with open(fn_mocha, "rb") as f:
+                # Streamed from the file by expat, without reading it into memory first
+                dct = xmltodict.parse(f)
+            if 'summary' in dct:
+                raise ValueError(f"{fn_mocha} already has a 'summary' key")
 
             n_total = int(dct['testsuites']['@tests'])
             n_failed = int(dct['testsuites']['@failures'])
@@ -207,8 +185,9 @@ class TypeScriptDockerRepo(AbstractDockerRepo):
             return {}
 
         try:
-            dct = json.load(open(fn_jest, "r"))
-            assert 'summary' not in dct
+            dct = load_json_report(fn_jest)
+            if 'summary' in dct:
+                raise ValueError(f"{fn_jest} already has a 'summary' key")
 
             n_total = dct['numTotalTests']
             n_passed = dct['numPassedTests']
@@ -270,7 +249,7 @@ class TypeScriptDockerRepo(AbstractDockerRepo):
 
         try:
             self.evaluation_time = time.time()
-            self.timeout_exec_run(f"bash -c '{command}'", timeout=timeout)
+            self.timeout_exec_run(["bash", "-c", command], timeout=timeout)
         except TimeOutException:
             logger.error("Timeout exception during test execution")
             self.return_code = 2
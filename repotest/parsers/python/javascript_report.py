@@ -0,0 +1,29 @@
+import json
+import mmap
+import os
+from typing import Any
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    # orjson decodes straight from a buffer (memoryview of an mmap)
+    _JSON_LOADS_BUFFERS = True
+except ImportError:
+    _json_loads = json.loads
+    _JSON_LOADS_BUFFERS = False
+
+_MMAP_THRESHOLD = 16 * 1024 * 1024
+
+
+def load_json_report(path: str) -> Any:
+    """
+    Decode a JSON report file.
+
+    orjson is used when installed; it decodes a big report straight from a read-only
+    mapping of the file instead of a copy of it in memory.
+    """
+    with open(path, "rb") as f:
+        if _JSON_LOADS_BUFFERS and os.fstat(f.fileno()).st_size >= _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return _json_loads(view)
+        return _json_loads(f.read())
@@ -1,34 +1,68 @@
 import re
 from typing import Any, Dict
 
+# Compiled once at import; the parsers run on every run_test
+_MOCHA_PASSING_RE = re.compile(r'^\s*✓\s+(.+)$', re.MULTILINE)
+_MOCHA_FAILING_RE = re.compile(r'^\s*\d+\)\s+(.+)$', re.MULTILINE)
+_MOCHA_COUNTS_RE = re.compile(r'(\d+)\s+(passing|failing|pending)')
+_MOCHA_FAILURE_SECTION_RE = re.compile(r'\n\s*\d+\).+?(?=\n\s*\d+\)|$)', re.DOTALL)
+
+_JEST_TEST_RE = re.compile(r'(PASS|FAIL)\s+(.+\.test\.\w+)', re.MULTILINE)
+_JEST_TESTS_LINE_RE = re.compile(r'Tests:\s+(.+)')
+_JEST_COUNTS_RE = re.compile(r'(\d+)\s+(failed|passed|skipped|total)')
+_JEST_FAILURE_RE = re.compile(r'●.+?(?=●|Tests:|$)', re.DOTALL)
+
+# detect_test_framework scores: one point per marker found in the output
+_JEST_MARKERS = tuple(re.compile(pattern, re.MULTILINE) for pattern in (
+    r'PASS\s+',
+    r'FAIL\s+',
+    r'Tests:\s+\d+',
+    r'Snapshots:\s+\d+',
+    r'Time:\s+[\d.]+\s*s',
+    r'Ran all test suites',
+))
+_MOCHA_MARKERS = tuple(re.compile(pattern, re.MULTILINE) for pattern in (
+    r'\d+\s+passing',
+    r'\d+\s+failing',
+    r'\d+\s+pending',
+    r'^\s*✓\s+',
+    r'^\s*\d+\)\s+',
+))
+
+
+def _first_counts(pattern: re.Pattern, s: str, n_keys: int) -> Dict[str, int]:
+    """First "<n> <keyword>" count per keyword, in a single scan of ``s``."""
+    counts = {}
+    for match in pattern.finditer(s):
+        counts.setdefault(match.group(2), int(match.group(1)))
+        if len(counts) == n_keys:
+            break
+    return counts
+
 
 def parse_mocha_stdout(s: str) -> Dict[str, Any]:
     """Parses mocha stdout into a structured JSON format."""
     res = {"tests": [], "summary": {}, "failures": [], "out": s, "summary_raw": ""}
     
     # Extract test results - mocha format: ✓ test name or 1) test name (for failures)
-    passing_pattern = re.compile(r'^\s*✓\s+(.+)$', re.MULTILINE)
-    failing_pattern = re.compile(r'^\s*\d+\)\s+(.+)$', re.MULTILINE)
+    append = res["tests"].append
+    for match in _MOCHA_PASSING_RE.finditer(s):
+        append({"name": match.group(1).strip(), "status": "PASSED"})
     
-    for match in passing_pattern.finditer(s):
-        res["tests"].append({"name": match.group(1).strip(), "status": "PASSED"})
-    
-    for match in failing_pattern.finditer(s):
-        res["tests"].append({"name": match.group(1).strip(), "status": "FAILED"})
+    for match in _MOCHA_FAILING_RE.finditer(s):
+        append({"name": match.group(1).strip(), "status": "FAILED"})
     
     # Extract summary - mocha format: "5 passing" or "2 failing"
-    passing = re.search(r'(\d+)\s+passing', s)
-    failing = re.search(r'(\d+)\s+failing', s)
-    pending = re.search(r'(\d+)\s+pending', s)
+    counts = _first_counts(_MOCHA_COUNTS_RE, s, 3)
     
-    res["summary"]["passed"] = int(passing.group(1)) if passing else 0
-    res["summary"]["failed"] = int(failing.group(1)) if failing else 0
+    res["summary"]["passed"] = counts.get("passing", 0)
+    res["summary"]["failed"] = counts.get("failing", 0)
     res["summary"]["error"] = 0
-    res["summary"]["skipped"] = int(pending.group(1)) if pending else 0
+    res["summary"]["skipped"] = counts.get("pending", 0)
     res["summary"]["total"] = res["summary"]["passed"] + res["summary"]["failed"]
     
     # Extract failure details
-    failure_section = re.search(r'\n\s*\d+\).+?(?=\n\s*\d+\)|$)', s, re.DOTALL)
+    failure_section = _MOCHA_FAILURE_SECTION_RE.search(s)
     if failure_section:
         res["failures"].append(failure_section.group(0))
         res["summary_raw"] = failure_section.group(0)
@@ -49,31 +83,26 @@ def parse_jest_stdout(s: str) -> Dict[str, Any]:
     res = {"tests": [], "summary": {}, "failures": [], "out": s, "summary_raw": ""}
     
     # Extract test results - jest format: PASS/FAIL followed by file path
-    test_pattern = re.compile(r'(PASS|FAIL)\s+(.+\.test\.\w+)', re.MULTILINE)
-    
-    for match in test_pattern.finditer(s):
+    append = res["tests"].append
+    for match in _JEST_TEST_RE.finditer(s):
         status, name = match.groups()
-        res["tests"].append({"name": name.strip(), "status": status})
+        append({"name": name.strip(), "status": status})
     
     # Extract summary - jest format: "Tests: 2 failed, 3 passed, 5 total"
-    tests_line = re.search(r'Tests:\s+(.+)', s)
+    tests_line = _JEST_TESTS_LINE_RE.search(s)
     if tests_line:
         res["summary_raw"] = tests_line.group(0)
         
-        failed = re.search(r'(\d+)\s+failed', tests_line.group(1))
-        passed = re.search(r'(\d+)\s+passed', tests_line.group(1))
-        skipped = re.search(r'(\d+)\s+skipped', tests_line.group(1))
-        total = re.search(r'(\d+)\s+total', tests_line.group(1))
+        counts = _first_counts(_JEST_COUNTS_RE, tests_line.group(1), 4)
         
-        res["summary"]["failed"] = int(failed.group(1)) if failed else 0
-        res["summary"]["passed"] = int(passed.group(1)) if passed else 0
+        res["summary"]["failed"] = counts.get("failed", 0)
+        res["summary"]["passed"] = counts.get("passed", 0)
         res["summary"]["error"] = 0
-        res["summary"]["skipped"] = int(skipped.group(1)) if skipped else 0
-        res["summary"]["total"] = int(total.group(1)) if total else 0
+        res["summary"]["skipped"] = counts.get("skipped", 0)
+        res["summary"]["total"] = counts.get("total", 0)
     
     # Extract failure details
-    failure_pattern = re.compile(r'●.+?(?=●|Tests:|$)', re.DOTALL)
-    failures = failure_pattern.findall(s)
+    failures = _JEST_FAILURE_RE.findall(s)
     if failures:
         res["failures"] = [f.strip() for f in failures]
     
@@ -90,27 +119,8 @@ def parse_jest_stdout(s: str) -> Dict[str, Any]:
 
 def detect_test_framework(s: str) -> str:
     """Detects whether the output is from Mocha or Jest."""
-    # Jest specific patterns
-    jest_patterns = [
-        r'PASS\s+',
-        r'FAIL\s+',
-        r'Tests:\s+\d+',
-        r'Snapshots:\s+\d+',
-        r'Time:\s+[\d.]+\s*s',
-        r'Ran all test suites'
-    ]
-    
-    # Mocha specific patterns
-    mocha_patterns = [
-        r'\d+\s+passing',
-        r'\d+\s+failing',
-        r'\d+\s+pending',
-        r'^\s*✓\s+',
-        r'^\s*\d+\)\s+'
-    ]
-    
-    jest_score = sum(1 for pattern in jest_patterns if re.search(pattern, s, re.MULTILINE))
-    mocha_score = sum(1 for pattern in mocha_patterns if re.search(pattern, s, re.MULTILINE))
+    jest_score = sum(1 for pattern in _JEST_MARKERS if pattern.search(s))
+    mocha_score = sum(1 for pattern in _MOCHA_MARKERS if pattern.search(s))
     
     if jest_score > mocha_score:
         return "jest"
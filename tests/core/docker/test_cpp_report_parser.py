@@ -0,0 +1,149 @@
+# test_cpp_report_parser.py
+from repotest.core.docker.cpp import _binary_results, _dedupe_test_binaries, parse_cpp_test_report
+
+CTEST_SITE_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<Site BuildName="Linux-c++" Name="runner">
+  <Testing>
+    <StartDateTime>Jan 01 00:00 UTC</StartDateTime>
+    <TestList>
+      <Test>./tests/math_test</Test>
+      <Test>./tests/io_test</Test>
+    </TestList>
+    <Test Status="passed">
+      <Name>math_test</Name>
+      <Path>./tests</Path>
+      <FullName>./tests/math_test</FullName>
+      <Results>
+        <NamedMeasurement type="numeric/double" name="Execution Time"><Value>0.01</Value></NamedMeasurement>
+      </Results>
+    </Test>
+    <Test Status="failed">
+      <Name>io_test</Name>
+      <Path>./tests</Path>
+      <FullName>./tests/io_test</FullName>
+      <Results>
+        <Measurement>expected 1, got 2</Measurement>
+      </Results>
+    </Test>
+  </Testing>
+</Site>
+"""
+
+JUNIT_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<testsuites>
+  <testsuite name="math" tests="3" failures="1" errors="0" skipped="1">
+    <testcase name="add" classname="math" time="0.5"/>
+    <testcase name="sub" classname="math" time="0.25">
+      <failure message="boom">trace</failure>
+    </testcase>
+    <testcase name="mul" classname="math" time="0">
+      <skipped message="later"/>
+    </testcase>
+  </testsuite>
+</testsuites>
+"""
+
+
+def test_ctest_status_attribute():
+    # CTest writes the status as <Test Status="...">, not as a <Status> child
+    result = parse_cpp_test_report(CTEST_SITE_XML)
+    assert result["summary"]["total"] == 2
+    assert result["summary"]["passed"] == 1
+    assert result["summary"]["failed"] == 1
+    assert result["status"] == "failed"
+
+    by_name = {test["name"]: test for test in result["tests"]}
+    assert set(by_name) == {"math_test", "io_test"}
+    assert by_name["math_test"]["status"] == "passed"
+    assert by_name["math_test"]["classname"] == "./tests"
+    assert by_name["io_test"]["status"] == "failed"
+    assert by_name["io_test"]["message"] == "expected 1, got 2"
+
+
+def test_ctest_status_element_wins_over_attribute():
+    content = CTEST_SITE_XML.replace(
+        b"<Name>math_test</Name>", b"<Name>math_test</Name><Status>failed</Status>"
+    )
+    result = parse_cpp_test_report(content)
+    assert result["summary"]["passed"] == 0
+    assert result["summary"]["failed"] == 2
+
+
+def test_ctest_long_preamble():
+    # The root element is found however much precedes it
+    comment = b"<!-- " + b"x" * 10000 + b" -->\n"
+    content = CTEST_SITE_XML.replace(b"<Site ", comment + b"<Site ", 1)
+    assert parse_cpp_test_report(content) == parse_cpp_test_report(CTEST_SITE_XML)
+
+
+def test_ctest_all_passed():
+    content = CTEST_SITE_XML.replace(b'Status="failed"', b'Status="passed"')
+    result = parse_cpp_test_report(content)
+    assert result["summary"]["passed"] == 2
+    assert result["summary"]["collected"] == 2
+    assert result["status"] == "passed"
+
+
+def test_junit_xml():
+    result = parse_cpp_test_report(JUNIT_XML)
+    assert result["summary"] == {
+        "total": 3, "passed": 1, "failed": 1, "skipped": 1, "errors": 0, "collected": 3
+    }
+    assert [test["status"] for test in result["tests"]] == ["passed", "failed", "skipped"]
+    assert result["tests"][1]["message"] == "boom"
+    assert result["tests"][1]["details"] == "trace"
+
+
+def test_report_path(tmp_path):
+    report = tmp_path / "Test.xml"
+    report.write_bytes(CTEST_SITE_XML)
+    assert parse_cpp_test_report(str(report)) == parse_cpp_test_report(CTEST_SITE_XML)
+    assert parse_cpp_test_report(str(tmp_path / "missing.xml")) == {}
+
+
+def test_binary_results_without_exit_marker(tmp_path):
+    (tmp_path / "tests__io_test.log").write_bytes(b"[ RUN      ] Io.Read\n")
+    stdout = b"__REPOTEST_EXIT__:tests/math_test:0\n"
+    result = _binary_results(["/run_dir/build/tests/math_test", "/run_dir/build/tests/io_test"], stdout, str(tmp_path))
+    assert result["summary"] == {"total": 2, "passed": 1, "failed": 1, "skipped": 0, "errors": 0, "collected": 2}
+    assert result["status"] == "failed"
+    assert result["tests"][1]["name"] == "tests/io_test"
+    assert result["tests"][1]["message"] == "Timed out: [ RUN      ] Io.Read\n"
+
+
+def test_dedupe_test_binaries(tmp_path):
+    for rel, size in [("build/tests/big_test", 30), ("build/tests/unit_test", 10),
+                      ("build/bin/unit_test", 20), ("build/tests/io_test", 5)]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"\0" * size)
+    binaries = ["/run_dir/build/tests/big_test", "/run_dir/build/bin/unit_test",
+                "/run_dir/build/tests/unit_test", "/run_dir/build/tests/io_test", "/run_dir/build/gone_test"]
+    assert _dedupe_test_binaries(binaries, limit=10, host_dir=str(tmp_path)) == [
+        "/run_dir/build/tests/io_test",
+        "/run_dir/build/tests/unit_test",
+        "/run_dir/build/tests/big_test",
+        "/run_dir/build/gone_test",
+    ]
+    assert _dedupe_test_binaries(binaries, limit=2, host_dir=str(tmp_path)) == [
+        "/run_dir/build/tests/io_test",
+        "/run_dir/build/tests/unit_test",
+    ]
+
+
+def test_junit_xml_summary_only():
+    content = JUNIT_XML.replace(
+        b"</testsuites>",
+        b'<testsuite name="io" tests="2" failures="0" errors="0" skipped="0">'
+        b'<testcase name="read" classname="io"/><testcase name="write" classname="io"/>'
+        b"</testsuite></testsuites>",
+    )
+    detailed = parse_cpp_test_report(content)
+    summary_only = parse_cpp_test_report(content, detailed=False)
+    assert summary_only["summary"] == detailed["summary"] == {
+        "total": 5, "passed": 3, "failed": 1, "skipped": 1, "errors": 0, "collected": 5
+    }
+    assert summary_only["status"] == detailed["status"] == "failed"
+    # The all-passed suite is counted from its attributes and adds no test entries
+    assert [test["name"] for test in detailed["tests"]] == ["add", "sub", "mul", "read", "write"]
+    assert [test["name"] for test in summary_only["tests"]] == ["add", "sub", "mul"]
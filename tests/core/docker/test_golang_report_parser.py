@@ -0,0 +1,181 @@
+# test_golang_report_parser.py
+import io
+import json
+
+import pytest
+
+from repotest.core.docker.golang import (_parse_go_json, _parse_go_json_parallel,
+                                         _parse_go_junit_xml, parse_go_test_report)
+
+GO_TEST_EVENTS = [
+    {"Action": "start", "Package": "example.com/calc"},
+    {"Action": "run", "Package": "example.com/calc", "Test": "TestAdd"},
+    {"Action": "output", "Package": "example.com/calc", "Test": "TestAdd", "Output": "=== RUN   TestAdd\n"},
+    {"Action": "pass", "Package": "example.com/calc", "Test": "TestAdd", "Elapsed": 0.01},
+    {"Action": "run", "Package": "example.com/calc", "Test": "TestDiv"},
+    {"Action": "output", "Package": "example.com/calc", "Test": "TestDiv", "Output": "calc_test.go:12: division by zero\n"},
+    {"Action": "fail", "Package": "example.com/calc", "Test": "TestDiv", "Elapsed": 0.02},
+    {"Action": "run", "Package": "example.com/calc", "Test": "TestPow"},
+    {"Action": "skip", "Package": "example.com/calc", "Test": "TestPow", "Elapsed": 0},
+    {"Action": "output", "Package": "example.com/calc", "Output": "FAIL\n"},
+    {"Action": "fail", "Package": "example.com/calc", "Elapsed": 0.05},
+    {"Action": "pass", "Package": "example.com/empty", "Elapsed": 0},
+]
+
+
+def write_events(path, events, separators):
+    path.write_text("".join(json.dumps(event, separators=separators) + "\n" for event in events))
+    return str(path)
+
+
+@pytest.mark.parametrize("separators", [(",", ":"), (", ", ": ")], ids=["compact", "spaced"])
+def test_go_json_summary_matches_full_parse(tmp_path, separators):
+    report = write_events(tmp_path / "go-test.json", GO_TEST_EVENTS, separators)
+    full = parse_go_test_report(report)
+    summary_only = parse_go_test_report(report, summary_only=True)
+
+    assert full["summary"] == {
+        "total": 3, "passed": 1, "failed": 1, "skipped": 1, "errors": 0, "collected": 3
+    }
+    assert full["status"] == "failed"
+    assert summary_only["tests"] == []
+    assert summary_only["summary"] == full["summary"]
+    assert summary_only["status"] == full["status"]
+    assert summary_only["packages"] == full["packages"]
+
+
+def test_go_json_summary_quoted_keys_in_output(tmp_path):
+    # Output text quoting the key layout is escaped, so it is not taken for a test event
+    events = [
+        {"Action": "output", "Package": "example.com/calc", "Output": '{"Test":"TestX","Action":"pass"}\n'},
+        {"Action": "pass", "Package": "example.com/calc", "Elapsed": 0.1},
+    ]
+    report = write_events(tmp_path / "go-test.json", events, (",", ":"))
+    summary_only = parse_go_test_report(report, summary_only=True)
+    assert summary_only["summary"] == parse_go_test_report(report)["summary"]
+    assert summary_only["summary"]["total"] == 1
+    assert summary_only["status"] == "unknown"
+
+
+def test_go_json_test_records(tmp_path):
+    report = write_events(tmp_path / "go-test.json", GO_TEST_EVENTS, (",", ":"))
+    tests = {test["name"]: test for test in parse_go_test_report(report)["tests"]}
+    assert tests["TestDiv"] == {
+        "name": "TestDiv",
+        "classname": "example.com/calc",
+        "time": 0.02,
+        "status": "failed",
+        "output": ["calc_test.go:12: division by zero\n"],
+        "message": "calc_test.go:12: division by zero\n",
+        "details": "calc_test.go:12: division by zero\n",
+    }
+    # A test without output events still has the (empty) output list
+    assert tests["TestPow"] == {
+        "name": "TestPow", "classname": "example.com/calc", "time": 0, "status": "skipped", "output": []
+    }
+
+def test_go_json_parallel_matches_serial(tmp_path):
+    # Interleaved packages, so events of one test land in different worker ranges
+    events = []
+    for i in range(40):
+        package = f"example.com/p{i % 3}"
+        test = f"Test{i}"
+        events.append({"Action": "run", "Package": package, "Test": test})
+        events.append({"Action": "output", "Package": package, "Test": test, "Output": f"=== RUN   {test}\n"})
+    for i in range(40):
+        package = f"example.com/p{i % 3}"
+        test = f"Test{i}"
+        events.append({"Action": "output", "Package": package, "Test": test, "Output": f"line of {test}\n"})
+        action = "fail" if i % 7 == 0 else "skip" if i % 11 == 0 else "pass"
+        events.append({"Action": action, "Package": package, "Test": test, "Elapsed": i / 100})
+    for i in range(3):
+        events.append({"Action": "fail", "Package": f"example.com/p{i}", "Elapsed": 1.5})
+    report = write_events(tmp_path / "go-test.json", events, (",", ":"))
+    size = (tmp_path / "go-test.json").stat().st_size
+
+    with open(report, "rb") as f:
+        serial = _parse_go_json(f)
+    parallel = _parse_go_json_parallel(report, size, workers=3)
+
+    assert parallel == serial
+    assert serial["summary"]["total"] == 40
+    assert serial["tests"][0]["message"] == "=== RUN   Test0\nline of Test0\n"
+
+
+
+@pytest.mark.parametrize("summary_only", [False, True], ids=["full", "summary"])
+def test_go_json_non_object_lines_skipped(tmp_path, summary_only):
+    # Valid JSON lines that are not events are ignored, as are files made only of them
+    report = tmp_path / "go-test.json"
+    lines = [json.dumps(event) for event in GO_TEST_EVENTS]
+    lines[1:1] = ["42", "[1, 2]", '"text"', "null"]
+    report.write_text("\n".join(lines) + "\n")
+    result = parse_go_test_report(str(report), summary_only=summary_only)
+    assert result["summary"]["total"] == 3
+    assert result["summary"]["failed"] == 1
+
+    stray = tmp_path / "other.json"
+    stray.write_text(json.dumps([{"Action": "pass", "Test": "TestX", "Package": "p"}]))
+    result = parse_go_test_report(str(stray), summary_only=summary_only)
+    assert result.get("summary", {}).get("total", 0) == 0
+
+def parse_junit(content):
+    return _parse_go_junit_xml(io.BytesIO(content), "report.xml")
+
+
+def test_junit_bad_counters_do_not_drop_sibling_suite():
+    # Suite a has unusable counters: its cases are counted from their statuses,
+    # and closing the valid suite b must not discard them
+    result = parse_junit(b"""<testsuites>
+  <testsuite name="a" tests="x" failures="1">
+    <testcase name="TestA1" time="0.1"><failure message="boom">trace</failure></testcase>
+    <testcase name="TestA2" time="0.1"/>
+  </testsuite>
+  <testsuite name="b" tests="1" failures="0" errors="0" skipped="0">
+    <testcase name="TestB1" time="0.1"/>
+  </testsuite>
+</testsuites>""")
+    assert result["summary"] == {
+        "total": 3, "passed": 2, "failed": 1, "skipped": 0, "errors": 0, "collected": 3
+    }
+    assert result["status"] == "failed"
+
+
+def test_junit_outer_suite_cases_survive_nested_suite():
+    # Cases directly under an outer suite are not cleared when a nested suite closes
+    result = parse_junit(b"""<testsuite name="outer" tests="3" failures="1">
+  <testcase name="TestOuter1" time="0.1"><failure message="boom"/></testcase>
+  <testsuite name="inner" tests="1" failures="0">
+    <testcase name="TestInner" time="0.1"/>
+  </testsuite>
+  <testcase name="TestOuter2" time="0.1"><skipped message="later"/></testcase>
+</testsuite>""")
+    assert len(result["tests"]) == 3
+    assert result["summary"] == {
+        "total": 3, "passed": 1, "failed": 1, "skipped": 1, "errors": 0, "collected": 3
+    }
+
+
+def test_junit_unreadable_testcase_counted_as_error():
+    result = parse_junit(b"""<testsuites>
+  <testsuite name="a" tests="2" failures="0" errors="0" skipped="0">
+    <testcase name="TestOk" time="0.1"/>
+    <testcase name="TestBad" time="n/a"/>
+  </testsuite>
+</testsuites>""")
+    assert [test["status"] for test in result["tests"]] == ["passed", "error"]
+    assert result["summary"]["total"] == 2
+    assert result["summary"]["errors"] == 1
+    assert result["summary"]["passed"] == 1
+    assert result["status"] == "failed"
+
+
+def test_junit_truncated_report_keeps_read_cases():
+    result = parse_junit(b"""<testsuites>
+  <testsuite name="a" tests="2" failures="0">
+    <testcase name="TestA1" time="0.1"/>
+    <testcase name="TestA2" time="0.1"><failure message="boom"/></testcase>
+    <testcase name="TestA3" ti""")
+    assert result["summary"]["total"] == 2
+    assert result["summary"]["failed"] == 1
+
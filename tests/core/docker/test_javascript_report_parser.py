@@ -0,0 +1,51 @@
+# test_javascript_report_parser.py
+import json
+
+from repotest.core.docker.javascript import JavaScriptDockerRepo
+from repotest.parsers.python import javascript_report
+from repotest.parsers.python.javascript_report import load_json_report
+
+MOCHA_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<!-- mocha-junit-reporter -->
+<testsuites name="Mocha Tests" tests="2" failures="1">
+  <testsuite name="Root Suite" tests="0" failures="0"/>
+  <testsuite name="math" tests="2" failures="1">
+    <testcase name="adds" classname="math"/>
+    <testcase name="subs" classname="math">
+      <failure message="boom"><![CDATA[AssertionError: boom]]></failure>
+      <system-out>one</system-out>
+      <system-out>two</system-out>
+    </testcase>
+  </testsuite>
+</testsuites>
+"""
+
+
+def test_read_mocha_xml(tmp_path):
+    (tmp_path / "test-results.xml").write_bytes(MOCHA_XML)
+    repo = JavaScriptDockerRepo.__new__(JavaScriptDockerRepo)
+    repo.cache_folder = str(tmp_path)
+    report = repo.read_mocha_xml()
+    assert report["summary"] == {"total": 2, "passed": 1, "failed": 1, "collected": 2}
+    suites = report["testsuites"]["testsuite"]
+    assert [suite["@name"] for suite in suites] == ["Root Suite", "math"]
+    failed = suites[1]["testcase"][1]
+    assert failed["failure"] == {"@message": "boom", "#text": "AssertionError: boom"}
+    assert failed["system-out"] == ["one", "two"]
+    (tmp_path / "test-results.xml").unlink()
+    assert repo.read_mocha_xml() == {}
+
+
+def test_load_json_report_reads_rewritten_file(tmp_path, monkeypatch):
+    report = tmp_path / "jest-results.json"
+    report.write_text(json.dumps({"numTotalTests": 1}))
+    assert load_json_report(str(report)) == {"numTotalTests": 1}
+    # Every call decodes the current file; results are not shared between calls
+    report.write_text(json.dumps({"numTotalTests": 2}))
+    first = load_json_report(str(report))
+    assert first == {"numTotalTests": 2}
+    assert load_json_report(str(report)) is not first
+    # Big reports go through the mmap path
+    monkeypatch.setattr(javascript_report, "_MMAP_THRESHOLD", 0)
+    assert load_json_report(str(report)) == {"numTotalTests": 2}
+
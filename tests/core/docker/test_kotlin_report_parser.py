@@ -0,0 +1,101 @@
+# test_kotlin_report_parser.py
+import json
+
+from repotest.core.docker import kotlin
+from repotest.core.docker.kotlin import _parse_report_files, parse_kotlin_test_report
+
+# Gradle writes one file like this per test class
+GRADLE_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<testsuite name="com.example.CalculatorTest" tests="4" skipped="1" failures="1" errors="1" time="0.05">
+  <properties/>
+  <testcase name="adds()" classname="com.example.CalculatorTest" time="0.01"/>
+  <testcase name="divides()" classname="com.example.CalculatorTest" time="0.02">
+    <failure message="expected: &lt;2&gt; but was: &lt;3&gt;" type="AssertionFailedError">stack trace</failure>
+  </testcase>
+  <testcase name="parses()" classname="com.example.CalculatorTest" time="0.01">
+    <error message="boom" type="IllegalStateException">error trace</error>
+  </testcase>
+  <testcase name="later()" classname="com.example.CalculatorTest" time="0">
+    <skipped/>
+  </testcase>
+  <system-out><![CDATA[]]></system-out>
+  <system-err><![CDATA[]]></system-err>
+</testsuite>
+"""
+
+NESTED_XML = b"""<testsuite name="outer" tests="99" failures="99">
+  <testcase name="ignored" classname="outer"/>
+  <testsuite name="first" tests="1" failures="0">
+    <testcase name="a" classname="first" time="0.5"/>
+  </testsuite>
+  <testsuite name="second" tests="2" failures="1">
+    <testcase name="b" classname="second"/>
+    <testcase name="c" classname="second"><failure message="no">trace</failure></testcase>
+  </testsuite>
+</testsuite>
+"""
+
+
+def test_gradle_junit_xml(tmp_path):
+    report = tmp_path / "TEST-com.example.CalculatorTest.xml"
+    report.write_bytes(GRADLE_XML)
+    result = parse_kotlin_test_report(str(report))
+    assert result["summary"] == {"total": 4, "passed": 1, "failed": 1, "skipped": 1, "errors": 1}
+    assert result["status"] == "failed"
+    assert result["tests"] == [
+        {"name": "adds()", "classname": "com.example.CalculatorTest", "time": 0.01, "status": "passed"},
+        {"name": "divides()", "classname": "com.example.CalculatorTest", "time": 0.02, "status": "failed",
+         "message": "expected: <2> but was: <3>", "details": "stack trace"},
+        {"name": "parses()", "classname": "com.example.CalculatorTest", "time": 0.01, "status": "error",
+         "message": "boom", "details": "error trace"},
+        {"name": "later()", "classname": "com.example.CalculatorTest", "time": 0.0, "status": "skipped",
+         "message": ""},
+    ]
+
+
+def test_nested_suites(tmp_path):
+    # As with root.findall(".//testsuite"): only the nested suites count, in document order
+    report = tmp_path / "nested.xml"
+    report.write_bytes(NESTED_XML)
+    result = parse_kotlin_test_report(str(report))
+    assert result["summary"] == {"total": 3, "passed": 2, "failed": 1, "skipped": 0, "errors": 0}
+    assert [test["name"] for test in result["tests"]] == ["a", "b", "c"]
+
+
+def test_testsuites_root(tmp_path):
+    report = tmp_path / "all.xml"
+    report.write_bytes(b"<testsuites>" + GRADLE_XML.split(b"?>", 1)[1] + b"</testsuites>")
+    result = parse_kotlin_test_report(str(report))
+    assert result["summary"]["total"] == 4
+    assert len(result["tests"]) == 4
+
+
+def test_json_reports(tmp_path):
+    report = tmp_path / "report.json"
+    data = {"tests": [], "summary": {"total": 0}}
+    report.write_text("\n  " + json.dumps(data))
+    assert parse_kotlin_test_report(str(report)) == data
+    report.write_text(json.dumps({"other": 1}))
+    assert parse_kotlin_test_report(str(report)) == {}
+
+
+def test_empty_missing_and_broken(tmp_path):
+    empty = tmp_path / "empty.xml"
+    empty.write_bytes(b"  \n")
+    assert parse_kotlin_test_report(str(empty)) == {}
+    assert parse_kotlin_test_report(str(tmp_path / "missing.xml")) == {}
+    broken = tmp_path / "broken.xml"
+    broken.write_bytes(GRADLE_XML[:200])
+    assert parse_kotlin_test_report(str(broken)) == {}
+
+
+def test_parallel_matches_serial(tmp_path, monkeypatch):
+    paths = []
+    for i in range(4):
+        report = tmp_path / f"TEST-{i}.xml"
+        report.write_bytes(GRADLE_XML if i % 2 else NESTED_XML)
+        paths.append(str(report))
+    serial = [parse_kotlin_test_report(path) for path in paths]
+    monkeypatch.setattr(kotlin, "_PARALLEL_PARSE_THRESHOLD", 0)
+    monkeypatch.setattr(kotlin.os, "cpu_count", lambda: 2)
+    assert _parse_report_files(paths) == serial